@@ -5,15 +5,224 @@ Uses Google Gemini API to generate natural language summaries,
 creative route names, and intermediate city extraction for analyzed routes.
 """
 
+import asyncio
+import hashlib
 import json
 import os
+import random
+import time
+from pathlib import Path
 from typing import Dict, List, Any, Optional
-import google.generativeai as genai
 from ..utils.logger import get_logger
 from ..config.api_keys import get_gemini_key
 
 logger = get_logger("ml_module.analysis.gemini_summary")
 
+# Try to import orjson (optional dependency) for faster JSON parse/serialize
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _json_loads(text: str) -> Any:
+    """Parse JSON with orjson when available, stdlib json otherwise."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _json_dumps_compact(obj: Any) -> str:
+    """Serialize to compact JSON with orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, separators=(',', ':'))
+
+
+# Maximum number of path points sent to Gemini per route
+PATH_SAMPLE_POINTS = 8
+
+GEMINI_MODEL_NAME = 'gemini-flash-latest'
+
+# Model instance reused across calls; building one per call would re-create
+# the underlying gRPC stubs every time
+_MODEL = None
+
+# Backpressure for the per-route fan-out: without a bound, a large batch
+# fires every prompt at once and stampedes straight into 429s. Retries back
+# off multiplicatively with jitter so desynchronized routes don't re-collide.
+MAX_CONCURRENT_SUMMARIES = 4
+RETRY_BASE_DELAY_S = 2.0
+MAX_ATTEMPTS = 3
+
+# Substrings that mark a quota/rate error worth retrying; anything else
+# (bad key, safety block, parse error) fails fast
+_RETRYABLE_MARKERS = ("429", "quota", "rate", "resource exhausted", "503")
+
+_PROMPT_TEMPLATE = """
+        You are a Logistics Analysis Expert. Analyze this supply chain route from {origin} to {destination}.
+
+        Route Data:
+        {route_json}
+
+        Task:
+        1. Give the route a unique, creative, professional name based on its characteristics (e.g., "The Coastal Expressway", "The Industrial Corridor").
+        2. Write a 1-sentence 'short_summary' highlighting the key trade-off (e.g., "Fastest route but high weather risk").
+        3. Write a 'reasoning' paragraph explaining why it got its resilience score.
+        4. Identify 3-5 major intermediate cities/towns along the route based on the path sample and general geography. Return their approx latitude/longitude if possible, otherwise Estimate.
+
+        Output strictly valid JSON in this format:
+        {{
+            "route_name": "Name",
+            "short_summary": "Summary",
+            "reasoning": "Reasoning",
+            "intermediate_cities": [
+                {{"name": "CityName", "lat": 0.0, "lon": 0.0}}
+            ]
+        }}
+        """
+
+
+def _parse_response_text(text: str) -> Dict[str, Any]:
+    """
+    Strip Markdown code fences if present and parse the JSON payload.
+
+    If prose surrounds the object despite the prompt's instructions, a
+    single raw_decode from the first brace recovers it in one C-level pass
+    instead of scanning the response character by character.
+    """
+    if text.startswith("```json"):
+        text = text[7:]
+    if text.endswith("```"):
+        text = text[:-3]
+    text = text.strip()
+
+    try:
+        return _json_loads(text)
+    except ValueError:
+        idx = text.find('{')
+        if idx == -1:
+            raise
+        obj, _ = json.JSONDecoder().raw_decode(text, idx)
+        return obj
+
+
+async def _summarize_route(model, route_ctx: Dict[str, Any],
+                           overall_context: Dict[str, Any],
+                           semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+    """
+    Generate the summary for a single route via the async Gemini API.
+
+    The semaphore bounds how many prompts are in flight at once, and
+    quota/rate errors retry with jittered multiplicative backoff. Errors are
+    still isolated per route: one failed summary returns {} without voiding
+    the others.
+    """
+    prompt = _PROMPT_TEMPLATE.format(
+        origin=overall_context.get('origin', 'Origin'),
+        destination=overall_context.get('destination', 'Destination'),
+        route_json=_json_dumps_compact(route_ctx)
+    )
+
+    for attempt in range(MAX_ATTEMPTS):
+        try:
+            async with semaphore:
+                response = await model.generate_content_async(prompt)
+            return _parse_response_text(response.text)
+        except Exception as e:
+            message = str(e)
+            retryable = any(marker in message.lower() for marker in _RETRYABLE_MARKERS)
+            if retryable and attempt < MAX_ATTEMPTS - 1:
+                # Multiplicative backoff with [0.75, 1.25] jitter so the
+                # throttled routes don't all retry at the same instant
+                delay = RETRY_BASE_DELAY_S * (2 ** attempt) * random.uniform(0.75, 1.25)
+                logger.warning("Gemini rate-limited for %s (attempt %d/%d), retrying in %.1fs",
+                               route_ctx.get('id'), attempt + 1, MAX_ATTEMPTS, delay)
+                await asyncio.sleep(delay)
+                continue
+            logger.error(f"Gemini summary failed for {route_ctx.get('id')}: {message}")
+            return {}
+    return {}
+
+
+def _get_model(api_key: str):
+    """
+    Get the shared GenerativeModel, configuring the SDK on first use.
+
+    The SDK is imported lazily: it drags in gRPC/protobuf/auth (hundreds of
+    ms and tens of MB), which callers not using Gemini shouldn't pay for.
+    """
+    global _MODEL
+    if _MODEL is None:
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key)
+        # JSON response mode: the model emits the object directly instead of
+        # wrapping it in Markdown fences and prose, so the parse path almost
+        # always succeeds on its first orjson attempt
+        _MODEL = genai.GenerativeModel(
+            GEMINI_MODEL_NAME,
+            generation_config={"response_mime_type": "application/json"},
+        )
+    return _MODEL
+
+# Summaries are cached on a canonical key so re-runs with the same
+# origin/destination and near-identical scores skip the Gemini round-trip.
+# A small in-memory layer sits in front of the disk cache: repeated scoring
+# of the same corridor within one process (UI re-renders, batch retries)
+# becomes a dict lookup instead of a file read. The time bucket in the key
+# gives both tiers a TTL, so stale narratives age out without a sweeper.
+CACHE_DIR = Path(__file__).resolve().parent.parent / "cache" / "gemini"
+CACHE_TTL_S = 3600
+
+_memory_cache: Dict[str, Dict[str, Any]] = {}
+
+
+def _summary_cache_key(routes_data: List[Dict[str, Any]],
+                       overall_context: Dict[str, Any]) -> str:
+    """
+    Build a cache key for a summary request.
+
+    Scores are rounded to one decimal so slightly-perturbed re-analyses of the
+    same corridor still hit the cache; anything that changes the narrative
+    (routes, endpoints, materially different scores) produces a new key, and
+    the hour bucket expires entries without explicit eviction.
+    """
+    canonical = {
+        "origin": overall_context.get("origin"),
+        "destination": overall_context.get("destination"),
+        "bucket": int(time.time() // CACHE_TTL_S),
+        "routes": [
+            [r.get("route_name", "Unknown"),
+             round(r.get("overall_resilience_score", 0), 1)]
+            for r in routes_data
+        ],
+    }
+    payload = json.dumps(canonical, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _downsample_uniform(coords: List[Any], k: int = PATH_SAMPLE_POINTS) -> List[Any]:
+    """
+    Pick at most k evenly-spaced points from a coordinate list.
+
+    A fixed point budget keeps the prompt size constant regardless of route
+    length, unlike stride-based sampling which grows with the route.
+
+    Args:
+        coords: List of [lat, lon] coordinates
+        k: Maximum number of points to return
+
+    Returns:
+        List of at most k coordinates, including the first and last
+    """
+    if len(coords) <= k:
+        return list(coords)
+    step = (len(coords) - 1) / (k - 1)
+    return [coords[round(i * step)] for i in range(k)]
+
+
 def generate_summary(routes_data: List[Dict[str, Any]], 
                     overall_context: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -43,18 +252,31 @@ def generate_summary(routes_data: List[Dict[str, Any]],
         logger.error("Gemini API key not found. Skipping summary generation.")
         return {}
 
+    cache_key = _summary_cache_key(routes_data, overall_context)
+    cached = _memory_cache.get(cache_key)
+    if cached is not None:
+        logger.info("Gemini summary served from memory cache")
+        return cached
+
+    cache_path = CACHE_DIR / f"{cache_key}.json"
+    if cache_path.exists():
+        try:
+            result = json.loads(cache_path.read_text(encoding="utf-8"))
+            _memory_cache[cache_key] = result
+            logger.info("Gemini summary served from cache")
+            return result
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Failed to read cached Gemini summary: {str(e)}")
+
     try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-flash-latest')
-        
+        model = _get_model(api_key)
+
+
         # Prepare simple context for Gemini
         routes_context = []
         for route in routes_data:
             # Safely get scores, defaulting to 0 if missing
             resilience = route.get('overall_resilience_score', 0)
-            
-            # Extract component scores if available
-            comp_scores = route.get('component_scores', {})
             weather_risk = route.get('avg_weather_risk', 0)
             safety_score = route.get('road_safety_score', 0.5)
             carbon_score = route.get('carbon_score', 0)
@@ -69,54 +291,53 @@ def generate_summary(routes_data: List[Dict[str, Any]],
                     "road_safety": safety_score,
                     "carbon_efficiency": carbon_score
                 },
-                # Provide a sample of coordinates for city extraction context
-                # Taking every 50th point to keep prompt size manageable but give path context
-                "path_sample": route.get("coordinates", [])[::50] if route.get("coordinates") else []
+                # Provide a sample of coordinates for city extraction context.
+                # A fixed budget of evenly-spaced points keeps prompt tokens
+                # bounded even for very long routes.
+                "path_sample": _downsample_uniform(route.get("coordinates") or [])
             }
             routes_context.append(summary_obj)
 
-        prompt = f"""
-        You are a Logistics Analysis Expert. Analyze these supply chain routes from {overall_context.get('origin', 'Origin')} to {overall_context.get('destination', 'Destination')}.
+        # Fan the per-route prompts out concurrently: total latency is one
+        # Gemini round-trip instead of one per route, and a single failed
+        # route no longer voids the whole batch
+        logger.info(f"Sending {len(routes_context)} route summary request(s) to Gemini...")
 
-        Routes Data:
-        {json.dumps(routes_context, indent=2)}
+        async def _summarize_all():
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_SUMMARIES)
+            return await asyncio.gather(*[
+                _summarize_route(model, ctx, overall_context, semaphore)
+                for ctx in routes_context
+            ])
 
-        Task:
-        1. Give each route a unique, creative, professional name based on its characteristics (e.g., "The Coastal Expressway", "The Industrial Corridor").
-        2. Write a 1-sentence 'short_summary' highlighting the key trade-off (e.g., "Fastest route but high weather risk").
-        3. Write a 'reasoning' paragraph explaining why it got its resilience score.
-        4. Identify 3-5 major intermediate cities/towns along the route based on the path samples and general geography. Return their approx latitude/longitude if possible, otherwise Estimate.
+        summaries = asyncio.run(_summarize_all())
 
-        Output strictly valid JSON in this format:
-        {{
-            "Route 1": {{
-                "route_name": "Name",
-                "short_summary": "Summary",
-                "reasoning": "Reasoning",
-                "intermediate_cities": [
-                    {{"name": "CityName", "lat": 0.0, "lon": 0.0}}
-                ]
-            }},
-            ... (for all routes)
-        }}
-        """
+        result = {
+            ctx["id"]: summary
+            for ctx, summary in zip(routes_context, summaries)
+            if summary
+        }
 
-        logger.info("Sending request to Gemini...")
-        response = model.generate_content(prompt)
-        
-        # Parse JSON from response
-        text = response.text
-        # Clean up code blocks if present
-        if text.startswith("```json"):
-            text = text[7:]
-        if text.endswith("```"):
-            text = text[:-3]
-            
-        result = json.loads(text.strip())
-        
         for route_id, route_data in result.items():
             logger.debug(f"Gemini response for {route_id}: {route_data}")
 
+        # Only cache complete batches: a short result means some routes
+        # failed (quota, safety block, bad key), and pinning that under the
+        # TTL bucket would suppress every retry for the rest of the hour
+        if len(result) < len(routes_context):
+            logger.warning(
+                "Gemini summarized %d of %d route(s); skipping cache write",
+                len(result), len(routes_context)
+            )
+            return result
+
+        _memory_cache[cache_key] = result
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            cache_path.write_text(json.dumps(result), encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"Failed to cache Gemini summary: {str(e)}")
+
         logger.info("Successfully generated Gemini summaries")
         return result
 
@@ -7,6 +7,9 @@ Combines road quality scores with weather risk assessment (weather data provided
 
 from typing import List, Dict, Any, Tuple, Optional
 from collections import defaultdict
+from pathlib import Path
+import numpy as np
+from .segmentation import haversine_distance
 from ..utils.logger import get_logger
 
 logger = get_logger("ml_module.analysis.road")
@@ -17,6 +20,13 @@ try:
     import osmnx as ox
     import networkx as nx
     OSMNX_AVAILABLE = True
+    # Persist Overpass responses on disk: every graph_from_point call hits
+    # the Overpass API and parses a multi-MB reply, so repeat queries around
+    # the same point (re-runs, neighbouring routes) should reuse the cached
+    # response instead of re-downloading it
+    ox.settings.use_cache = True
+    ox.settings.cache_folder = str(
+        Path(__file__).resolve().parent.parent / "cache" / "osmnx")
     logger.info("OSMnx available for road type analysis")
 except ImportError:
     OSMNX_AVAILABLE = False
@@ -61,12 +71,33 @@ class RoadAnalyzer:
         'unknown': 50
     }
     
+    # Cache key precision: ~11 m at 4 decimal places, well below the 500 m
+    # radius of an OSMnx point query, so nearby lookups share one entry
+    CACHE_PRECISION = 4
+
+    # Length thresholds (meters) for the fallback road type estimate, in
+    # ascending order for np.searchsorted; bin i maps to FALLBACK_TYPES[i]
+    FALLBACK_LENGTH_BINS = (2000.0, 5000.0, 10000.0)
+    FALLBACK_TYPES = ('tertiary', 'secondary', 'primary', 'motorway')
+
+    # Region graph limits: one bbox download amortizes the Overpass fetch
+    # across every point inside it, but past ~50 km the single query grows
+    # slower than the per-point fetches it replaces
+    REGION_BUFFER_M = 5000.0
+    REGION_MAX_DIAGONAL_M = 50000.0
+
     def __init__(self):
         """Initialize the Road Analyzer."""
         logger.info("RoadAnalyzer initialized")
         self.osmnx_available = OSMNX_AVAILABLE
         logger.info(f"OSMnx available (detected): {OSMNX_AVAILABLE}")
-    
+
+        # Road types are static, so entries never expire within a process.
+        # Alternative routes over the same corridor share mid-points, which
+        # makes repeat OSMnx queries (graph download + nearest-node search)
+        # pure waste without this.
+        self._road_type_cache: Dict[Tuple[float, float], str] = {}
+
     def analyze(
         self,
         pre_extracted_segments: List[List],
@@ -137,24 +168,32 @@ class RoadAnalyzer:
         
         return results
     
-    def analyze_segment(self, 
-                       mid_point: Tuple[float, float], 
-                       length_m: float, 
-                       osmnx_enabled: bool = False) -> Dict[str, Any]:
+    def analyze_segment(self,
+                       mid_point: Tuple[float, float],
+                       length_m: float,
+                       osmnx_enabled: bool = False,
+                       region_graph=None) -> Dict[str, Any]:
         """
         Analyze a single segment based on valid parameters.
-        
+
         Args:
             mid_point: (lat, lon) tuple
             length_m: Length in meters
             osmnx_enabled: Whether to use OSMnx
-            
+            region_graph: Optional graph from prepare_region covering this
+                point; avoids a per-point 500 m graph download
+
         Returns:
             Dictionary with road type, width, base quality
         """
         # 1. Determine road type
         if osmnx_enabled and self.osmnx_available:
-            road_type = self._get_osmnx_road_type_at_point(mid_point)
+            cache_key = (round(mid_point[0], self.CACHE_PRECISION),
+                         round(mid_point[1], self.CACHE_PRECISION))
+            road_type = self._road_type_cache.get(cache_key)
+            if road_type is None:
+                road_type = self._get_osmnx_road_type_at_point(mid_point, region_graph)
+                self._road_type_cache[cache_key] = road_type
         else:
             road_type = self._estimate_road_type(length_m)
             
@@ -162,7 +201,10 @@ class RoadAnalyzer:
         road_width = self.WIDTH_MAPPING.get(road_type, 5.0)
         base_quality = self.QUALITY_SCORES.get(road_type, 50)
 
-        logger.debug(f"Road at ({mid_point[0]:.4f}, {mid_point[1]:.4f}): road_type={road_type}, road_width={road_width:.2f}m, base_quality={base_quality}")
+        # %-style: this log fires once per segment, so skip the string build
+        # entirely unless DEBUG is enabled
+        logger.debug("Road at (%.4f, %.4f): road_type=%s, road_width=%.2fm, base_quality=%s",
+                    mid_point[0], mid_point[1], road_type, road_width, base_quality)
         
         return {
             "road_type": road_type,
@@ -170,24 +212,87 @@ class RoadAnalyzer:
             "base_quality": base_quality
         }
 
-    def _get_osmnx_road_type_at_point(self, point: Tuple[float, float]) -> str:
+    def prepare_region(self,
+                       points: List[Tuple[float, float]],
+                       buffer_m: Optional[float] = None):
+        """
+        Download one graph covering all points for subsequent lookups.
+
+        Candidate routes over the same corridor query overlapping areas, so
+        a single buffered bounding-box download amortizes the Overpass fetch
+        and graph simplification across every per-point lookup that follows.
+        Regions whose diagonal exceeds REGION_MAX_DIAGONAL_M are refused -
+        one huge query would be slower than the per-point fetches.
+
+        The graph is returned rather than stored: this analyzer is shared
+        across concurrently analyzed routes, and instance state would let
+        one route swap in a graph that doesn't cover another route's points
+        mid-lookup. Callers thread it through analyze_segment.
+
+        Args:
+            points: (lat, lon) tuples the region must cover
+            buffer_m: Margin around the bounding box (default REGION_BUFFER_M)
+
+        Returns:
+            The region graph, or None if per-point fetching should be used
+            instead
+        """
+        if not (OSMNX_AVAILABLE and self.osmnx_available) or not points:
+            return None
+
+        lats = [p[0] for p in points]
+        lons = [p[1] for p in points]
+        south, north = min(lats), max(lats)
+        west, east = min(lons), max(lons)
+
+        diagonal_m = haversine_distance(south, west, north, east)
+        if diagonal_m > self.REGION_MAX_DIAGONAL_M:
+            logger.info("Region diagonal %.0fm exceeds limit - using per-point graphs",
+                        diagonal_m)
+            return None
+
+        # Degrees of margin; 1 degree of latitude is ~111 km
+        margin = (buffer_m if buffer_m is not None else self.REGION_BUFFER_M) / 111000.0
+
+        try:
+            # OSMnx 2.x signature: bbox is (left, bottom, right, top)
+            graph = ox.graph_from_bbox(
+                bbox=(west - margin, south - margin,
+                      east + margin, north + margin),
+                network_type='drive', simplify=True, retain_all=False,
+                truncate_by_edge=True
+            )
+            logger.info("Prepared region graph covering %d point(s)", len(points))
+            return graph
+        except Exception as e:
+            logger.warning(f"Region graph download failed: {str(e)}")
+            return None
+
+    def _road_type_from_graph(self, G, lat: float, lon: float) -> str:
+        """Read the highway tag of the nearest edge to a point in a graph."""
+        node = ox.nearest_nodes(G, lon, lat)
+
+        # Check edges connected to this node
+        for neighbor in G.neighbors(node):
+            edge_data = G[node][neighbor][0]
+            highway = edge_data.get('highway', 'unknown')
+            if isinstance(highway, list):
+                highway = highway[0]
+            return str(highway)
+
+        return 'secondary'
+
+    def _get_osmnx_road_type_at_point(self, point: Tuple[float, float],
+                                      region_graph=None) -> str:
         """
         Get road type at a specific point using OSMnx.
         """
         try:
             lat, lon = point
+            if region_graph is not None:
+                return self._road_type_from_graph(region_graph, lat, lon)
             G = ox.graph_from_point((lat, lon), dist=500, network_type='drive')
-            node = ox.nearest_nodes(G, lon, lat)
-            
-            # Check edges connected to this node
-            for neighbor in G.neighbors(node):
-                edge_data = G[node][neighbor][0]
-                highway = edge_data.get('highway', 'unknown')
-                if isinstance(highway, list):
-                    highway = highway[0]
-                return str(highway)
-                
-            return 'secondary'
+            return self._road_type_from_graph(G, lat, lon)
         except Exception:
             return 'secondary'
 
@@ -198,3 +303,21 @@ class RoadAnalyzer:
         elif length_m > 2000: return 'secondary'
         else: return 'tertiary'
 
+    def estimate_road_types(self, lengths_m: np.ndarray) -> List[str]:
+        """
+        Estimate road types for many segments in one pass.
+
+        Branchless equivalent of _estimate_road_type: np.searchsorted buckets
+        every length against the thresholds at once, so callers with a whole
+        route's segments avoid per-segment method calls and branch trees.
+
+        Args:
+            lengths_m: Array of segment lengths in meters
+
+        Returns:
+            List of road type strings, aligned with lengths_m
+        """
+        bins = np.searchsorted(self.FALLBACK_LENGTH_BINS,
+                               np.asarray(lengths_m, dtype=np.float64))
+        return [self.FALLBACK_TYPES[i] for i in bins]
+
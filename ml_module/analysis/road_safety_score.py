@@ -10,6 +10,9 @@ road_safety_score = sum((road_quality_score[j] - weather_risk_score[j])*road_len
 """
 
 from typing import List, Dict, Any, Optional
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 from ..utils.logger import get_logger
 from .weather_analysis import WeatherAnalyzer
 from .road_analysis import RoadAnalyzer
@@ -17,16 +20,118 @@ from .road_analysis import RoadAnalyzer
 logger = get_logger("ml_module.analysis.road_safety")
 
 
+# Try to import Numba (optional dependency) to JIT-compile the scoring reduction
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+    logger.info("Numba available for JIT-compiled score reduction")
+except ImportError:
+    NUMBA_AVAILABLE = False
+    logger.info("Numba not available - using NumPy score reduction")
+
+
+def _compute_score_sums(quality: np.ndarray, risk: np.ndarray, lengths: np.ndarray):
+    """
+    Fused reduction of the per-segment scoring sums.
+
+    Args:
+        quality: Base road quality per segment (0-100)
+        risk: Weather risk per segment (0-1)
+        lengths: Segment lengths in meters
+
+    Returns:
+        Tuple of (weighted_sum, weighted_road_quality, total_length)
+    """
+    if NUMBA_AVAILABLE:
+        return _compute_score_sums_jit(quality, risk, lengths)
+
+    adjusted = quality - risk * 100
+    return (
+        float(np.dot(adjusted, lengths)),
+        float(np.dot(np.maximum(adjusted, 0.0), lengths)),
+        float(lengths.sum()),
+    )
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _compute_score_sums_jit(quality, risk, lengths):
+        # Single fused pass: LLVM vectorizes this where NumPy would need
+        # three separate array traversals plus a temporary for the clip
+        weighted_sum = 0.0
+        weighted_road_quality = 0.0
+        total_length = 0.0
+        for i in range(quality.shape[0]):
+            adjusted = quality[i] - risk[i] * 100.0
+            weighted_sum += adjusted * lengths[i]
+            if adjusted < 0.0:
+                adjusted = 0.0
+            weighted_road_quality += adjusted * lengths[i]
+            total_length += lengths[i]
+        return weighted_sum, weighted_road_quality, total_length
+
+
+def _segments_to_arrays(segments: List[Dict[str, Any]]):
+    """
+    Convert the segment dict list (AoS) into NumPy columns (SoA).
+
+    Mid-points for segments that lack one are derived from start/end in a
+    single vectorized pass instead of per-iteration tuple math.
+
+    Args:
+        segments: Segment dictionaries with length_m and mid or start/end
+
+    Returns:
+        Tuple of (mids, lengths) where mids is an (N, 2) float64 array of
+        segment mid-points and lengths an (N,) float32 array of meters.
+        Mid-points stay float64 because they feed coordinates back out at
+        the JSON boundary; the length column is only reduced numerically,
+        where float32 halves the working set at ~1 m resolution.
+    """
+    n = len(segments)
+    lengths = np.zeros(n, dtype=np.float32)
+    provided = np.zeros((n, 2), dtype=np.float64)
+    starts = np.zeros((n, 2), dtype=np.float64)
+    ends = np.zeros((n, 2), dtype=np.float64)
+    has_mid = np.zeros(n, dtype=bool)
+
+    for i, segment in enumerate(segments):
+        lengths[i] = segment.get("length_m", 0)
+        mid = segment.get("mid")
+        if mid:
+            has_mid[i] = True
+            provided[i] = mid
+        else:
+            start = segment.get("start")
+            end = segment.get("end")
+            if start and end:
+                starts[i] = start
+                ends[i] = end
+
+    mids = np.where(has_mid[:, None], provided, 0.5 * (starts + ends))
+    return mids, lengths
+
+
 class RoadSafetyScorer:
     """
     Scorer for road safety based on road quality and weather conditions.
     """
     
-    def __init__(self):
-        """Initialize the Road Safety Scorer."""
+    def __init__(self,
+                 weather_analyzer: Optional[WeatherAnalyzer] = None,
+                 road_analyzer: Optional[RoadAnalyzer] = None):
+        """
+        Initialize the Road Safety Scorer.
+
+        Args:
+            weather_analyzer: Optional shared WeatherAnalyzer. Passing the
+                same instance across routes lets overlapping corridors reuse
+                each other's in-memory weather grid cache.
+            road_analyzer: Optional shared RoadAnalyzer.
+        """
         logger.info("RoadSafetyScorer initialized")
-        self.weather_analyzer = WeatherAnalyzer()
-        self.road_analyzer = RoadAnalyzer()
+        self.weather_analyzer = weather_analyzer or WeatherAnalyzer()
+        self.road_analyzer = road_analyzer or RoadAnalyzer()
         
     def calculate(self, 
                  segment_data: List[Any], 
@@ -54,108 +159,167 @@ class RoadSafetyScorer:
 
         # Lists to collect granular results
         segment_results = []
+
+        # Per-segment numeric columns, reduced with NumPy after the loop
+        base_qualities = []
+        weather_risks = []
+
+        road_type_dist = defaultdict(float)
+
+        # Convert segments to SoA columns once: mid-points and lengths come out
+        # as NumPy arrays instead of being re-derived per iteration
+        mids, length_arr = _segments_to_arrays(segments)
+        mid_points = [(float(lat), float(lon)) for lat, lon in mids]
+
+        # Weather is sampled every 10th segment. The indices come from one
+        # strided arange and the points from a fancy-indexed slice of the
+        # mid-point array; Open-Meteo accepts coordinate lists, so all sampled
+        # points go out as a single batched request instead of one round-trip
+        # per point.
+        sample_indices = np.arange(0, len(segments), 10).tolist()
+        sample_points = [(float(lat), float(lon)) for lat, lon in mids[sample_indices]]
+
+        logger.info(f"Fetching weather for {len(sample_points)} sampled points")
+
+        # Weather and road analysis are independent until aggregation, so the
+        # batched weather request runs on the same pool as the per-segment
+        # road lookups and the two latencies overlap instead of adding up.
+        use_osmnx = bool(osmnx_enabled) and self.road_analyzer.osmnx_available
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            weather_future = pool.submit(
+                self.weather_analyzer.get_weather_batch, sample_points
+            )
+
+            # Get Road Scores for all segments.
+            # Returns {road_type, road_width, base_quality} per segment.
+            if use_osmnx:
+                # One buffered bbox download covering the whole route (when
+                # small enough) lets every per-segment lookup below reuse
+                # the graph instead of fetching its own 500 m graph. It is
+                # held locally and threaded through each call because the
+                # analyzer itself is shared across concurrent routes.
+                region_graph = self.road_analyzer.prepare_region(mid_points)
+
+                # The OSMnx path does network I/O per segment, so analyze the
+                # segments across the pool and aggregate sequentially below.
+                road_data = list(pool.map(
+                    lambda args: self.road_analyzer.analyze_segment(
+                        args[0], args[1], osmnx_enabled,
+                        region_graph=region_graph),
+                    zip(mid_points, length_arr)
+                ))
+            else:
+                # The fallback estimate is pure math on segment lengths:
+                # classify every segment in one branchless searchsorted pass
+                # instead of dispatching per-segment calls through the pool.
+                # Only a handful of fallback types exist, so the width/quality
+                # lookups run once per distinct type and the resulting dicts
+                # are shared across segments - downstream only reads them
+                # (and spreads them into fresh enriched dicts).
+                road_types = self.road_analyzer.estimate_road_types(length_arr)
+                type_props = {
+                    rt: {
+                        "road_type": rt,
+                        "road_width": self.road_analyzer.WIDTH_MAPPING.get(rt, 5.0),
+                        "base_quality": self.road_analyzer.QUALITY_SCORES.get(rt, 50)
+                    }
+                    for rt in set(road_types)
+                }
+                road_data = [type_props[rt] for rt in road_types]
+
+            fetched = weather_future.result()
+
+        weather_samples = {}
         weather_data_list = []
-        
-        weighted_sum = 0.0
-        total_length = 0.0
-        
-        # Track aggregates for final summary
-        total_rainfall = 0.0
-        total_wind = 0.0
-        total_vis = 0.0
-        total_temp = 0.0
-        total_cloud = 0.0
-        total_weather_risk = 0.0
-        
-        road_type_dist = {}
-        weighted_road_quality = 0.0
-        
+        for idx, sample in zip(sample_indices, fetched):
+            sample["sample_id"] = idx
+            sample["location"] = mid_points[idx]
+            weather_samples[idx] = sample
+            weather_data_list.append(sample)
+
+        # One weather sample covers a window of 10 segments: update the
+        # reference at sample boundaries and reuse it for the rest of the window.
+        current_w = None
+
         for i, segment in enumerate(segments):
-            length = segment.get("length_m", 0)
-            mid_point = segment.get("mid")
-            
-            if not mid_point:
-                start = segment.get("start")
-                end = segment.get("end")
-                if start and end:
-                    mid_point = ((start[0] + end[0])/2, (start[1] + end[1])/2)
-                else:
-                    mid_point = (0.0, 0.0)
-            
-            # 1. Get Road Score for this segment
-            # Returns {road_type, road_width, base_quality}
-            r_data = self.road_analyzer.analyze_segment(mid_point, length, osmnx_enabled)
-            
+            length = float(length_arr[i])
+            r_data = road_data[i]
+
             # 2. Get Weather Data for this segment
             # Returns {weather_risk_score, rainfall_mm, ...}
-            if i % 10 == 0:
-                w_data = self.weather_analyzer.get_weather_at_point(mid_point[0], mid_point[1])
-                w_data["sample_id"] = i
-                w_data["location"] = mid_point
-            
-            # --- Scoring Logic ---
-            base_quality = r_data["base_quality"]
-            weather_risk = w_data["weather_risk_score"]
-            
-            # road_safety_score += (road_score - weather_data["weather_risk"]) * length
-            # Normalize risk to 0-100 to match quality scale
-            term = (base_quality - (weather_risk * 100)) * length
-            weighted_sum += term
-            
-            total_length += length
-            
+            if i in weather_samples:
+                current_w = weather_samples[i]
+
+            # --- Scoring inputs (reduced vectorized below) ---
+            base_qualities.append(r_data["base_quality"])
+            weather_risks.append(current_w["weather_risk_score"])
+
             # --- Aggregation for Report ---
-            # Enrich segment with metadata
-            segment.update(r_data)
-            segment["weather"] = {
-                "rainfall_mm": w_data["rainfall_mm"],
-                "visibility_m": w_data["visibility_m"],
-                "windspeed": w_data["windspeed"],
-                "temperature": w_data["temperature"],
-                "cloudcover": w_data["cloudcover"]
-            }
-            segment_results.append(segment)
-            weather_data_list.append(w_data)
-            
-            # Weather aggregates
-            total_rainfall += w_data["rainfall_mm"]
-            total_wind += w_data["windspeed"]
-            total_vis += w_data["visibility_m"]
-            total_temp += w_data["temperature"]
-            total_cloud += w_data["cloudcover"]
-            total_weather_risk += weather_risk
-            
+            # Build a new enriched dict rather than mutating the caller's
+            # segment, so inputs stay read-only for retries and parallel runs
+            segment_results.append({
+                **segment,
+                **r_data,
+                "weather": {
+                    "rainfall_mm": current_w["rainfall_mm"],
+                    "visibility_m": current_w["visibility_m"],
+                    "windspeed": current_w["windspeed"],
+                    "temperature": current_w["temperature"],
+                    "cloudcover": current_w["cloudcover"]
+                }
+            })
+
             # Road aggregates
             rt = r_data["road_type"]
-            road_type_dist[rt] = road_type_dist.get(rt, 0) + (length / 1000)
-            
-            # Calculate quality score contribution for road_analysis report
-            # adjusted_quality = base_quality - (weather_risk * 100) -> max(0, ..)
-            adj_q = max(0, base_quality - (weather_risk * 100))
-            weighted_road_quality += adj_q * length
+            road_type_dist[rt] += length / 1000
+
+        # --- Final Calculation (vectorized) ---
+
+        # float32 columns: the scores span 0-100 with coarse inputs, so single
+        # precision loses nothing while halving memory traffic in the kernel
+        quality_arr = np.asarray(base_qualities, dtype=np.float32)
+        risk_arr = np.asarray(weather_risks, dtype=np.float32)
+
+        # road_safety_score = sum((base_quality - weather_risk*100) * length);
+        # the clipped variant feeds the road_analysis quality score
+        weighted_sum, weighted_road_quality, total_length = _compute_score_sums(
+            quality_arr, risk_arr, length_arr
+        )
 
-        # --- Final Calculation ---
-        
         # Safety Score
         final_score = 0.0
         if total_length > 0:
             final_score = weighted_sum / (100 * total_length)
         final_score = max(0.0, min(1.0, final_score))
-        
-        count = len(segments)
-        # Construct composite Weather Analysis Result
+
+        # Average over the actual weather samples, not over segments: every
+        # segment in a window shares one sample, so per-segment sums would just
+        # count duplicates. One matrix mean gives all averages in a single pass.
+        # weather_data_list is never empty here - segment 0 is always sampled
+        # and the empty-segments case returned default_result() above.
+        wd = np.array([
+            (w["rainfall_mm"], w["windspeed"], w["visibility_m"],
+             w["temperature"], w["cloudcover"], w["weather_risk_score"],
+             w["visibility_risk"], w["rain_risk"], w["wind_risk"])
+            for w in weather_data_list
+        ], dtype=np.float64)
+        (avg_rainfall, avg_windspeed, avg_visibility,
+         avg_temperature, avg_cloudcover, avg_weather_risk,
+         avg_visibility_risk, avg_rain_risk, avg_wind_risk) = wd.mean(axis=0)
+
         weather_analysis = {
             "weather_data": weather_data_list,
-            "avg_rainfall": total_rainfall / count if count else 0,
-            "avg_windspeed": total_wind / count if count else 0,
-            "avg_visibility": total_vis / count if count else 10000,
-            "avg_temperature": total_temp / count if count else 20,
-            "avg_cloudcover": int(total_cloud / count) if count else 30,
-            "avg_weather_risk": total_weather_risk / count if count else 0,
+            "avg_rainfall": float(avg_rainfall),
+            "avg_windspeed": float(avg_windspeed),
+            "avg_visibility": float(avg_visibility),
+            "avg_temperature": float(avg_temperature),
+            "avg_cloudcover": int(avg_cloudcover),
+            "avg_weather_risk": float(avg_weather_risk),
             # Risks (simplified average)
-            "visibility_risk": sum(w["visibility_risk"] for w in weather_data_list)/count if count else 0,
-            "rain_risk": sum(w["rain_risk"] for w in weather_data_list)/count if count else 0,
-            "wind_risk": sum(w["wind_risk"] for w in weather_data_list)/count if count else 0,
+            "visibility_risk": float(avg_visibility_risk),
+            "rain_risk": float(avg_rain_risk),
+            "wind_risk": float(avg_wind_risk),
         }
         
         # Construct composite Road Analysis Result
@@ -165,12 +329,12 @@ class RoadSafetyScorer:
         road_analysis = {
             "road_segments": segment_results,
             "road_quality_score": road_quality_score,
-            "avg_weather_risk": weather_analysis["avg_weather_risk"],
-            "total_rainfall": weather_analysis["avg_rainfall"],
-            "road_type_distribution": road_type_dist
+            "avg_weather_risk": float(avg_weather_risk),
+            "total_rainfall": float(avg_rainfall),
+            "road_type_distribution": dict(road_type_dist)
         }
-        
-        logger.info(f"Route '{route_name}': Safety Score = {final_score:.4f}, Weather Risk = {weather_analysis['avg_weather_risk']:.4f}")
+
+        logger.info(f"Route '{route_name}': Safety Score = {final_score:.4f}, Weather Risk = {avg_weather_risk:.4f}")
         
         return {
             "road_safety_score": final_score,
@@ -8,11 +8,23 @@ computing distances between coordinate pairs.
 from typing import List, Dict, Any, Tuple
 import math
 
+import numpy as np
+
 from ..utils.logger import get_logger
 
 logger = get_logger("ml_module.analysis.segmentation")
 
 
+# Try to import Numba (optional dependency) to JIT-compile the distance kernel
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+    logger.info("Numba available for JIT-compiled distance kernel")
+except ImportError:
+    NUMBA_AVAILABLE = False
+    logger.info("Numba not available - using NumPy distance kernel")
+
+
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
     Calculate distance between two coordinates using Haversine formula.
@@ -41,6 +53,63 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     return distance
 
 
+def haversine_distances(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    Vectorized Haversine distance for arrays of coordinate pairs.
+
+    Dispatches to a fused Numba kernel when available; the NumPy expression
+    below is the fallback.
+
+    Args:
+        starts: (N, 2) array of [lat, lon] start coordinates in degrees
+        ends: (N, 2) array of [lat, lon] end coordinates in degrees
+
+    Returns:
+        (N,) array of distances in meters
+    """
+    if NUMBA_AVAILABLE:
+        return _haversine_distances_jit(
+            np.ascontiguousarray(starts), np.ascontiguousarray(ends)
+        )
+
+    R = 6371000  # Earth radius in meters
+
+    phi1 = np.radians(starts[:, 0])
+    phi2 = np.radians(ends[:, 0])
+    delta_phi = np.radians(ends[:, 0] - starts[:, 0])
+    delta_lambda = np.radians(ends[:, 1] - starts[:, 1])
+
+    a = (np.sin(delta_phi / 2) ** 2 +
+         np.cos(phi1) * np.cos(phi2) *
+         np.sin(delta_lambda / 2) ** 2)
+
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+    return R * c
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _haversine_distances_jit(starts, ends):
+        # Single fused loop: the NumPy fallback above allocates a temporary
+        # per trig term, this touches each coordinate pair exactly once
+        R = 6371000.0
+        n = starts.shape[0]
+        out = np.empty(n, dtype=np.float64)
+        for i in range(n):
+            phi1 = math.radians(starts[i, 0])
+            phi2 = math.radians(ends[i, 0])
+            delta_phi = math.radians(ends[i, 0] - starts[i, 0])
+            delta_lambda = math.radians(ends[i, 1] - starts[i, 1])
+
+            a = (math.sin(delta_phi / 2) ** 2 +
+                 math.cos(phi1) * math.cos(phi2) *
+                 math.sin(delta_lambda / 2) ** 2)
+
+            out[i] = R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+        return out
+
+
 def extract_segments(route: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], float, float]:
     """
     Extract road segments from Google Maps route steps.
@@ -56,58 +125,47 @@ def extract_segments(route: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], float
         logger.warning("No steps found in route")
         return [], 0.0, 0.0
 
-    segments: List[Dict[str, Any]] = []
-    segment_id = 0
-    max_length_m = 0.0
-    min_length_m = float('inf')
-
-    for step in steps:
-        start_loc = step.get("start_location", {})
-        end_loc = step.get("end_location", {})
-
-        if not start_loc or not end_loc:
-            continue
-
-        start_lat = start_loc.get("lat", 0)
-        start_lon = start_loc.get("lng", 0)
-        end_lat = end_loc.get("lat", 0)
-        end_lon = end_loc.get("lng", 0)
-
-        if start_lat == 0 or start_lon == 0 or end_lat == 0 or end_lon == 0:
-            continue
-
-        # Calculate segment length using haversine formula
-        length_m = haversine_distance(start_lat, start_lon, end_lat, end_lon)
-
-        # Calculate mid-point
-        mid_lat = (start_lat + end_lat) / 2
-        mid_lon = (start_lon + end_lon) / 2
+    # Gather all step coordinates into one (N, 4) array so lengths,
+    # mid-points, and min/max come out of vectorized NumPy passes instead of
+    # per-step scalar trig in the interpreter
+    coords = np.array([
+        [step.get("start_location", {}).get("lat", 0),
+         step.get("start_location", {}).get("lng", 0),
+         step.get("end_location", {}).get("lat", 0),
+         step.get("end_location", {}).get("lng", 0)]
+        for step in steps
+    ], dtype=np.float64)
+
+    # Drop steps with missing coordinates (0 is the getter default)
+    valid = (coords != 0).all(axis=1)
+    coords = coords[valid]
+
+    if coords.shape[0] == 0:
+        logger.warning("No valid step coordinates found in route")
+        return [], 0.0, 0.0
 
-        segment = {
-            "segment_id": segment_id,
-            "start": (start_lat, start_lon),
-            "end": (end_lat, end_lon),
-            "mid": (mid_lat, mid_lon),
-            "length_m": length_m,
+    starts = coords[:, :2]
+    ends = coords[:, 2:]
+    lengths = haversine_distances(starts, ends)
+    mids = 0.5 * (starts + ends)
+
+    segments = [
+        {
+            "segment_id": i,
+            "start": (float(starts[i, 0]), float(starts[i, 1])),
+            "end": (float(ends[i, 0]), float(ends[i, 1])),
+            "mid": (float(mids[i, 0]), float(mids[i, 1])),
+            "length_m": float(lengths[i]),
         }
+        for i in range(coords.shape[0])
+    ]
 
-        max_length_m = max(max_length_m, length_m)
-        min_length_m = min(min_length_m, length_m)
-
-        segments.append(segment)
-        segment_id += 1
-
-    # Handle case when no segments were found
-    if not segments:
-        max_length_m = 0.0
-        min_length_m = 0.0
-    elif min_length_m == float('inf'):
-        # Safety fallback (shouldn't happen if segments exist)
-        min_length_m = max_length_m
+    max_length_m = float(lengths.max())
+    min_length_m = float(lengths.min())
 
     logger.debug(
-        f"Extracted {len(segments)} segments from {len(steps)} steps "
-        f"(min_length={min_length_m:.2f}m, max_length={max_length_m:.2f}m)"
+        "Extracted %d segments from %d steps (min_length=%.2fm, max_length=%.2fm)",
+        len(segments), len(steps), min_length_m, max_length_m
     )
     return segments, max_length_m, min_length_m
 
@@ -115,24 +173,23 @@ def extract_segments(route: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], float
 def extract_segments_for_routes(routes: List[Dict[str, Any]]) -> List[List]:
     """
     Extract segments for multiple routes.
-    
+
     Args:
         routes: List of route dictionaries, each containing 'steps'
-    
+
     Returns:
         List where each element is [route_name, segments, max_length_m, min_length_m] for that route
-        Format: [[route_name1, segments_route1, max_length_m_route1, min_length_m_route1], 
+        Format: [[route_name1, segments_route1, max_length_m_route1, min_length_m_route1],
                  [route_name2, segments_route2, max_length_m_route2, min_length_m_route2], ...]
     """
     results = []
-    
     for route in routes:
         route_name = route.get("route_name", "Unknown")
         logger.info(f"Extracting segments for route: {route_name}")
         segments, max_length_m, min_length_m = extract_segments(route)
-        results.append([route_name, segments, max_length_m, min_length_m])
         logger.info(f"Extracted {len(segments)} segments for route: {route_name}")
-    
+        results.append([route_name, segments, max_length_m, min_length_m])
+
     logger.info(f"Extracted segments for {len(routes)} routes")
     return results
 
@@ -5,12 +5,32 @@ Analyzes weather conditions along routes and calculates weather-related risks.
 Fetches weather data from Open-Meteo API and calculates risk scores.
 """
 
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
+import hashlib
+import json
+import time
+from pathlib import Path
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from ..utils.logger import get_logger
 
 logger = get_logger("ml_module.analysis.weather")
 
+# Try to import orjson (optional dependency) for faster response decoding
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _decode_response(response: requests.Response) -> Any:
+    """Decode an HTTP JSON body with orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
 
 class WeatherAnalyzer:
     """
@@ -25,11 +45,80 @@ class WeatherAnalyzer:
     
     # Sample weather every N km
     # WEATHER_SAMPLE_INTERVAL_KM = 50.0
-    
-    def __init__(self):
-        """Initialize the Weather Analyzer."""
+
+    # Cache entries are shared by points in the same ~1 km grid cell and hour:
+    # alternative routes over the same corridor hit the same cells, and weather
+    # barely changes at that scale
+    CACHE_PRECISION = 2    # decimal places of lat/lon (~1.1 km at the equator)
+    CACHE_TTL_S = 3600     # one entry per hour bucket
+    CACHE_DIR = Path(__file__).resolve().parent.parent / "cache" / "weather"
+
+    def __init__(self, session: Optional[requests.Session] = None):
+        """
+        Initialize the Weather Analyzer.
+
+        Args:
+            session: Optional shared requests.Session. When the orchestrator
+                passes its pooled session, weather requests share keep-alive
+                connections with the other API clients.
+        """
         logger.info("WeatherAnalyzer initialized")
-        
+        self._memory_cache: Dict[str, Dict[str, Any]] = {}
+
+        if session is not None:
+            self._session = session
+        else:
+            # Pooled session so keep-alive amortizes the TCP/TLS handshake
+            # across all weather requests instead of reconnecting per point
+            self._session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=16,
+                pool_maxsize=16,
+                max_retries=Retry(total=3, backoff_factor=0.3)
+            )
+            self._session.mount("https://", adapter)
+            self._session.mount("http://", adapter)
+
+    def _cache_key(self, lat: float, lon: float) -> str:
+        """Build a cache key from rounded coordinates and the current hour bucket."""
+        bucket = int(time.time() // self.CACHE_TTL_S)
+        return f"{round(lat, self.CACHE_PRECISION)},{round(lon, self.CACHE_PRECISION)},{bucket}"
+
+    def _cache_path(self, key: str) -> Path:
+        """Path of the on-disk cache file for a key."""
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return self.CACHE_DIR / f"{digest}.json"
+
+    def _cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached weather entry, checking memory then disk.
+
+        Returns a copy so callers can enrich the result without
+        poisoning the cache.
+        """
+        weather = self._memory_cache.get(key)
+        if weather is None:
+            path = self._cache_path(key)
+            if path.exists():
+                try:
+                    weather = json.loads(path.read_text(encoding="utf-8"))
+                    self._memory_cache[key] = weather
+                except (OSError, json.JSONDecodeError) as e:
+                    logger.warning(f"Failed to read weather cache entry {path.name}: {str(e)}")
+                    return None
+
+        return dict(weather) if weather is not None else None
+
+    def _cache_put(self, key: str, weather: Dict[str, Any]) -> None:
+        """Store a fetched weather entry in memory and on disk."""
+        self._memory_cache[key] = dict(weather)
+        try:
+            self.CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            self._cache_path(key).write_text(json.dumps(weather), encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"Failed to write weather cache entry: {str(e)}")
+
+
     def get_weather_at_point(self, lat: float, lon: float) -> Dict[str, Any]:
         """
         Get weather data for a specific coordinate point.
@@ -42,25 +131,114 @@ class WeatherAnalyzer:
             Dictionary with weather data and risk score (0-1)
         """
         weather = self._fetch_weather_open_meteo(lat, lon)
-        
-        # Calculate single point risk
+        return self._score_weather(weather, lat, lon)
+
+    def get_weather_batch(self, points: List[Tuple[float, float]]) -> List[Dict[str, Any]]:
+        """
+        Get weather data for multiple coordinate points in a single request.
+
+        Open-Meteo accepts comma-separated latitude/longitude lists and returns
+        one result object per coordinate, so N points cost one round-trip
+        instead of N.
+
+        Args:
+            points: List of (lat, lon) tuples
+
+        Returns:
+            List of weather dictionaries (with risk scores), aligned with points
+        """
+        if not points:
+            return []
+
+        # Serve what we can from the cache and only fetch the misses
+        weathers = [self._cache_get(self._cache_key(lat, lon)) for lat, lon in points]
+        miss_indices = [i for i, w in enumerate(weathers) if w is None]
+
+        if miss_indices:
+            logger.info(f"Weather cache: {len(points) - len(miss_indices)} hit(s), "
+                       f"fetching {len(miss_indices)} point(s)")
+            fetched = self._fetch_weather_batch([points[i] for i in miss_indices])
+            for i, weather in zip(miss_indices, fetched):
+                weathers[i] = weather
+        else:
+            logger.info(f"Weather cache: all {len(points)} point(s) served from cache")
+
+        return [self._score_weather(w, lat, lon)
+                for (lat, lon), w in zip(points, weathers)]
+
+    def _fetch_weather_batch(self, points: List[Tuple[float, float]]) -> List[Dict[str, Any]]:
+        """
+        Fetch weather for multiple points in a single Open-Meteo request.
+
+        Args:
+            points: List of (lat, lon) tuples
+
+        Returns:
+            List of weather dictionaries (without risk scores), aligned with points
+        """
+        try:
+            url = "https://api.open-meteo.com/v1/forecast"
+            params = {
+                "latitude": ",".join(str(lat) for lat, _ in points),
+                "longitude": ",".join(str(lon) for _, lon in points),
+                "current": "temperature_2m,cloudcover,precipitation,windspeed_10m"
+            }
+
+            response = self._session.get(url, params=params, timeout=10)
+            response.raise_for_status()
+            data = _decode_response(response)
+
+            # Open-Meteo returns a plain object for one point, a list for many
+            if isinstance(data, dict):
+                data = [data]
+            if len(data) != len(points):
+                raise ValueError(f"Expected {len(points)} results, got {len(data)}")
+
+            results = []
+            for (lat, lon), entry in zip(points, data):
+                weather = self._parse_current_weather(entry)
+                self._cache_put(self._cache_key(lat, lon), weather)
+                results.append(weather)
+
+            logger.info(f"Fetched weather for {len(points)} points in one batched request")
+            return results
+
+        except Exception as e:
+            logger.warning(f"Batched weather fetch failed ({str(e)}), "
+                          f"falling back to per-point requests")
+            return [self._fetch_weather_open_meteo(lat, lon) for lat, lon in points]
+
+    def _score_weather(self, weather: Dict[str, Any], lat: float, lon: float) -> Dict[str, Any]:
+        """
+        Attach risk scores (0-1) to a fetched weather dictionary.
+
+        Args:
+            weather: Weather data from Open-Meteo
+            lat: Latitude (for logging)
+            lon: Longitude (for logging)
+
+        Returns:
+            The weather dictionary enriched with risk fields
+        """
         visibility_risk = 1.0 - (weather["visibility_m"] / 10000)
         visibility_risk = max(0.0, min(1.0, visibility_risk))
-        
+
         rain_risk = min(1.0, weather["rainfall_mm"] / self.RAIN_CRITICAL_MM)
         wind_risk = min(1.0, weather["windspeed"] / self.WIND_CRITICAL_MS)
-        
+
         avg_risk = (visibility_risk + rain_risk + wind_risk) / 3
 
-        logger.debug(f"Weather risk at ({lat:.4f}, {lon:.4f}): {avg_risk}")
-        
+        # %-style so the format only runs when DEBUG is actually enabled;
+        # this fires once per sampled point
+        logger.debug("Weather risk at (%.4f, %.4f): %s", lat, lon, avg_risk)
+
         weather["weather_risk_score"] = avg_risk
         weather["visibility_risk"] = visibility_risk
         weather["rain_risk"] = rain_risk
         weather["wind_risk"] = wind_risk
-        
+
         return weather
-    
+
     def _fetch_weather_open_meteo(self, lat: float, lon: float) -> Dict[str, Any]:
         """
         Fetch weather data from Open-Meteo API.
@@ -72,6 +250,12 @@ class WeatherAnalyzer:
         Returns:
             Dictionary with weather data
         """
+        key = self._cache_key(lat, lon)
+        cached = self._cache_get(key)
+        if cached is not None:
+            logger.debug("Weather cache hit for (%.4f, %.4f)", lat, lon)
+            return cached
+
         try:
             url = "https://api.open-meteo.com/v1/forecast"
             params = {
@@ -79,34 +263,20 @@ class WeatherAnalyzer:
                 "longitude": lon,
                 "current": "temperature_2m,cloudcover,precipitation,windspeed_10m"
             }
-            
-            response = requests.get(url, params=params, timeout=10)
+
+            response = self._session.get(url, params=params, timeout=10)
             response.raise_for_status()
-            data = response.json()
-            
-            current = data.get("current", {})
-            
-            rainfall_mm = current.get("precipitation", 0)
-            windspeed = current.get("windspeed_10m", 0)
-            temperature = current.get("temperature_2m", 15)
-            cloudcover = current.get("cloudcover", 50)
-            
-            # Calculate visibility
-            visibility_m = max(100, 10000 - (windspeed * 100) - (rainfall_mm * 50))
-            
-            weather = {
-                "rainfall_mm": float(rainfall_mm),
-                "visibility_m": float(visibility_m),
-                "windspeed": float(windspeed),
-                "temperature": float(temperature),
-                "cloudcover": int(cloudcover)
-            }
-            
-            logger.debug(f"Weather at ({lat:.4f}, {lon:.4f}): rain={rainfall_mm}mm, "
-                        f"wind={windspeed}m/s, vis={visibility_m}m")
-            
+            data = _decode_response(response)
+
+            weather = self._parse_current_weather(data)
+            self._cache_put(key, weather)
+
+            logger.debug("Weather at (%.4f, %.4f): rain=%smm, wind=%sm/s, vis=%sm",
+                        lat, lon, weather['rainfall_mm'], weather['windspeed'],
+                        weather['visibility_m'])
+
             return weather
-            
+
         except Exception as e:
             logger.warning(f"Failed to fetch weather data: {str(e)}")
             # Return default moderate weather
@@ -117,7 +287,35 @@ class WeatherAnalyzer:
                 "temperature": 20.0,
                 "cloudcover": 30
             }
-    
+
+    def _parse_current_weather(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Parse the 'current' block of an Open-Meteo response.
+
+        Args:
+            data: One result object from the Open-Meteo API
+
+        Returns:
+            Dictionary with weather data
+        """
+        current = data.get("current", {})
+
+        rainfall_mm = current.get("precipitation", 0)
+        windspeed = current.get("windspeed_10m", 0)
+        temperature = current.get("temperature_2m", 15)
+        cloudcover = current.get("cloudcover", 50)
+
+        # Calculate visibility
+        visibility_m = max(100, 10000 - (windspeed * 100) - (rainfall_mm * 50))
+
+        return {
+            "rainfall_mm": float(rainfall_mm),
+            "visibility_m": float(visibility_m),
+            "windspeed": float(windspeed),
+            "temperature": float(temperature),
+            "cloudcover": int(cloudcover)
+        }
+
     def _create_default_result(self) -> Dict[str, Any]:
         """
         Create default result when analysis fails.
@@ -14,10 +14,22 @@ except ImportError:
     DOTENV_AVAILABLE = False
 
 
+# load_api_keys runs on every get_api_key call; only parse .env once
+_ENV_LOADED = False
+
+
 def load_api_keys() -> None:
     """
     Load API keys from .env file if available.
+
+    The .env file is parsed at most once per process; later calls return
+    immediately.
     """
+    global _ENV_LOADED
+    if _ENV_LOADED:
+        return
+    _ENV_LOADED = True
+
     if DOTENV_AVAILABLE:
         env_path = Path(".env")
         if env_path.exists():
@@ -8,65 +8,229 @@ Coordinates all analysis modules to:
 4. Return ranked routes with comprehensive metrics
 """
 
+from __future__ import annotations
+
 from typing import Dict, List, Optional, Tuple, Any
+import asyncio
+import hashlib
 import sys
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache, cached_property
 from pathlib import Path
+from types import MappingProxyType
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from ml_module.routes.google_maps_client import GoogleMapsClient
-from ml_module.routes.osrm_client import OSRMClient
-from ml_module.analysis.time_analysis import TimeAnalyzer
-from ml_module.analysis.distance_analysis import DistanceAnalyzer
-from ml_module.analysis.carbon_analysis import CarbonAnalyzer
-from ml_module.analysis.road_analysis import RoadAnalyzer
-from ml_module.analysis.weather_analysis import WeatherAnalyzer
-from ml_module.analysis.segmentation import extract_segments_for_routes
-from ml_module.analysis.road_safety_score import RoadSafetyScorer
-from ml_module.scoring.resilience_calculator import ResilienceCalculator
-from ml_module.analysis.gemini_summary import generate_summary
+# The analyzer/client imports are deliberately deferred into the factories
+# and cached_property accessors below: pulling them in eagerly triggers the
+# Numba, OSMnx, and Gemini SDK probes before argv is even validated, so the
+# CLI usage/error path pays seconds of import cost for nothing. Only the
+# (cheap, stdlib-backed) logger is imported at module level.
 from ml_module.utils.logger import get_logger
 
 logger = get_logger("ml_module.main")
 
+# Try to import orjson (optional dependency) for fast serialization of the
+# full result payload on the CLI output path
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _dumps_bytes(obj: Any) -> bytes:
+    """
+    Serialize a result payload to JSON bytes.
+
+    orjson handles numpy scalars/datetimes natively and is several times
+    faster than the stdlib on the large enriched-routes payload; the stdlib
+    path keeps default=str for the same tolerant behavior.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=str).encode("utf-8")
+
+# Banner separators, hoisted so log calls don't rebuild them
+_SEP80 = "=" * 80
+_SEP60 = "=" * 60
+
+# Shared read-only defaults for the .get(...) chains in _combine_results:
+# each literal {} / [] default allocates a fresh object per lookup even on
+# hits. _EMPTY_MAP is only ever a source for further .get calls, never part
+# of the serialized result (MappingProxyType is not JSON-serializable);
+# _EMPTY_TUP may reach the output, where json and orjson both encode a
+# tuple as an array.
+_EMPTY_MAP = MappingProxyType({})
+_EMPTY_TUP = ()
+
+
+# Process-wide singletons for the stateless analyzers: in a long-running
+# worker that constructs a RouteAnalysisSystem per request, re-instantiating
+# these per system is pure cold-start waste. RoadAnalyzer is included so its
+# road-type cache is shared across systems; the HTTP clients and
+# WeatherAnalyzer stay per-instance because they bind the system's session.
+@cache
+def _shared_time_analyzer() -> "TimeAnalyzer":
+    from ml_module.analysis.time_analysis import TimeAnalyzer
+    return TimeAnalyzer()
+
+
+@cache
+def _shared_distance_analyzer() -> "DistanceAnalyzer":
+    from ml_module.analysis.distance_analysis import DistanceAnalyzer
+    return DistanceAnalyzer()
+
+
+@cache
+def _shared_carbon_analyzer() -> "CarbonAnalyzer":
+    from ml_module.analysis.carbon_analysis import CarbonAnalyzer
+    return CarbonAnalyzer()
+
+
+@cache
+def _shared_road_analyzer() -> "RoadAnalyzer":
+    from ml_module.analysis.road_analysis import RoadAnalyzer
+    return RoadAnalyzer()
+
+
+@cache
+def _shared_resilience_calculator() -> "ResilienceCalculator":
+    from ml_module.scoring.resilience_calculator import ResilienceCalculator
+    return ResilienceCalculator()
+
+
+def _limit_cities(gemini_data: Dict[str, Any], limit: int = 2) -> List[Dict[str, Any]]:
+    """
+    Pick the first `limit` valid intermediate cities from a Gemini result.
+
+    Stops scanning as soon as enough valid entries are collected instead of
+    validating and rebuilding the whole list before truncating.
+
+    Args:
+        gemini_data: Per-route Gemini analysis dictionary
+        limit: Maximum number of cities to keep
+
+    Returns:
+        List of {name, lat, lon} dictionaries, at most `limit` long
+    """
+    cities = []
+    for city in gemini_data.get("intermediate_cities", ()):
+        if isinstance(city, dict) and "lat" in city and "lon" in city:
+            cities.append({
+                "name": city.get("name"),
+                "lat": city["lat"],
+                "lon": city["lon"]
+            })
+            if len(cities) == limit:
+                break
+    return cities
+
 
 class RouteAnalysisSystem:
     """
     Main orchestrator for route analysis system.
-    
+
     Coordinates route fetching, analysis, and scoring to provide
     comprehensive route recommendations.
     """
-    
+
+    # Route cache: repeat queries for the same origin/destination pair are
+    # common in batch planning, and the route fetch is the largest external
+    # round-trip. Keys round coordinates to 5 decimals (~1 m) and include a
+    # time bucket so traffic-sensitive durations expire.
+    ROUTE_CACHE_TTL_S = 600
+    ROUTE_CACHE_DIR = Path(__file__).resolve().parent / "cache" / "routes"
+
     def __init__(self):
-        """Initialize all components of the analysis system."""
-        logger.info("="*60)
-        logger.info("INITIALIZING ROUTE ANALYSIS SYSTEM")
-        logger.info("="*60)
-        
-        # Initialize route clients
-        self.google_maps_client = GoogleMapsClient()
-        self.osrm_client = OSRMClient()
-        
-        # Initialize analyzers
-        self.time_analyzer = TimeAnalyzer()
-        self.distance_analyzer = DistanceAnalyzer()
-        self.carbon_analyzer = CarbonAnalyzer()
-        self.weather_analyzer = WeatherAnalyzer()
-        self.road_analyzer = RoadAnalyzer()
-        self.road_safety_scorer = RoadSafetyScorer()
-        
+        """Initialize the analysis system (clients are built lazily)."""
+        logger.info("\n%s\nINITIALIZING ROUTE ANALYSIS SYSTEM\n%s", _SEP60, _SEP60)
+
+        # One pooled session shared by every HTTP client: keep-alive reuses
+        # connections across the Google/OSRM/weather calls of an analysis
+        # instead of paying a TCP+TLS handshake per request
+        self._session = requests.Session()
+        # Retry transient failures at the adapter level so a stray 429/503
+        # never forces a full re-plan upstream; POST is included because the
+        # ORS directions call is a POST, and Retry-After from rate limiters
+        # is honoured before the exponential backoff kicks in
+        adapter = HTTPAdapter(
+            pool_connections=20,
+            pool_maxsize=50,
+            max_retries=Retry(
+                total=3, connect=3, read=3, backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset(["GET", "POST"]),
+                respect_retry_after_header=True
+            )
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+        # In-memory route cache (JSON text keyed by OD pair + TTL bucket)
+        self._route_cache: Dict[str, str] = {}
+
         # Initialize helper functions
+        from ml_module.analysis.gemini_summary import generate_summary
         self.generate_summary = generate_summary
-        
-        # Initialize scorer
-        self.resilience_calculator = ResilienceCalculator()
-        
-        logger.info("All components initialized successfully")
-        logger.info("="*60)
-    
+
+        # Clients and analyzers are cached_property attributes below:
+        # callers that never touch a component (e.g. rescoring without route
+        # fetching) skip its construction cost entirely
+        logger.info("Core system initialized (components constructed on first use)\n%s", _SEP60)
+
+    @cached_property
+    def google_maps_client(self) -> "GoogleMapsClient":
+        """Google Maps client, constructed on first use."""
+        from ml_module.routes.google_maps_client import GoogleMapsClient
+        return GoogleMapsClient(session=self._session)
+
+    @cached_property
+    def osrm_client(self) -> "OSRMClient":
+        """OSRM fallback client, constructed on first use."""
+        from ml_module.routes.osrm_client import OSRMClient
+        return OSRMClient(session=self._session)
+
+    @cached_property
+    def time_analyzer(self) -> "TimeAnalyzer":
+        return _shared_time_analyzer()
+
+    @cached_property
+    def distance_analyzer(self) -> "DistanceAnalyzer":
+        return _shared_distance_analyzer()
+
+    @cached_property
+    def carbon_analyzer(self) -> "CarbonAnalyzer":
+        return _shared_carbon_analyzer()
+
+    @cached_property
+    def weather_analyzer(self) -> "WeatherAnalyzer":
+        from ml_module.analysis.weather_analysis import WeatherAnalyzer
+        return WeatherAnalyzer(session=self._session)
+
+    @cached_property
+    def road_analyzer(self) -> "RoadAnalyzer":
+        return _shared_road_analyzer()
+
+    @cached_property
+    def road_safety_scorer(self) -> "RoadSafetyScorer":
+        from ml_module.analysis.road_safety_score import RoadSafetyScorer
+        # Share the analyzers with the scorer so every route analyzed in this
+        # process hits the same weather grid cache
+        return RoadSafetyScorer(
+            weather_analyzer=self.weather_analyzer,
+            road_analyzer=self.road_analyzer
+        )
+
+    @cached_property
+    def resilience_calculator(self) -> "ResilienceCalculator":
+        return _shared_resilience_calculator()
+
     def analyze_routes(self,
                       origin: Tuple[float, float],
                       destination: Tuple[float, float],
@@ -74,10 +238,11 @@ class RouteAnalysisSystem:
                       origin_name: Optional[str] = None,
                       destination_name: Optional[str] = None,
                       max_alternatives: int = 3,
-                      osmnx_enabled: Optional[bool] = None) -> Dict[str, Any]:
+                      osmnx_enabled: Optional[bool] = None,
+                      gemini_enabled: Optional[bool] = None) -> Dict[str, Any]:
         """
         Main function to analyze routes and return resilience scores.
-        
+
         Args:
             origin: (latitude, longitude) of origin
             destination: (latitude, longitude) of destination
@@ -89,7 +254,13 @@ class RouteAnalysisSystem:
             origin_name: Optional name of origin location
             destination_name: Optional name of destination location
             max_alternatives: Maximum number of alternative routes to analyze
-        
+            osmnx_enabled: Optional override for OSMnx usage in road analysis
+            gemini_enabled: Pass False to skip Gemini summary generation —
+                the slowest step in the pipeline (an LLM round-trip). Routes
+                then carry the "Analysis pending..." placeholder text, which
+                is the right trade for bulk callers that only need the
+                numeric scores.
+
         Returns:
             Dictionary with:
             - routes: List of route dictionaries with all analysis data
@@ -97,16 +268,14 @@ class RouteAnalysisSystem:
             - best_route: Best route name
             - analysis_complete: Boolean status
         """
-        logger.info("="*80)
-        logger.info("STARTING COMPREHENSIVE ROUTE ANALYSIS")
-        logger.info("="*80)
-        logger.info(f"Origin: {origin_name or origin}")
-        logger.info(f"Destination: {destination_name or destination}")
-        logger.info(f"User priorities: {user_priorities}")
-        logger.info(f"Max alternatives: {max_alternatives}")
+        logger.info("\n%s\nSTARTING COMPREHENSIVE ROUTE ANALYSIS\n%s", _SEP80, _SEP80)
+        logger.info("Origin: %s", origin_name or origin)
+        logger.info("Destination: %s", destination_name or destination)
+        logger.info("User priorities: %s", user_priorities)
+        logger.info("Max alternatives: %s", max_alternatives)
         if osmnx_enabled is not None:
-            logger.info(f"OSMnx enabled (override from caller): {osmnx_enabled}")
-        
+            logger.info("OSMnx enabled (override from caller): %s", osmnx_enabled)
+
         # Set default priorities if not provided
         if not user_priorities:
             user_priorities = {
@@ -115,111 +284,153 @@ class RouteAnalysisSystem:
                 "carbon_emission": 0.25,
                 "road_quality": 0.25
             }
-            logger.info(f"Using default priorities: {user_priorities}")
-        
+            logger.info("Using default priorities: %s", user_priorities)
+
+        # Step 1: Get routes from Google Maps (with OSRM fallback).
+        # Only the fetch gets a try frame: a failure here is unrecoverable,
+        # while errors in later steps should not discard work already done.
+        logger.info("\n%s\nSTEP 1: FETCHING ROUTES\n%s", _SEP60, _SEP60)
+
         try:
-            # Step 1: Get routes from Google Maps (with OSRM fallback)
-            logger.info("\n" + "="*60)
-            logger.info("STEP 1: FETCHING ROUTES")
-            logger.info("="*60)
-            
             routes = self._get_routes(origin, destination, max_alternatives)
-            
-            if not routes:
-                logger.error("No routes found. Cannot proceed with analysis.")
+        except Exception as e:
+            logger.error("Route fetch failed: %s", str(e), exc_info=True)
+            return {
+                "error": str(e),
+                "routes": [],
+                "resilience_scores": None,
+                "analysis_complete": False
+            }
+
+        if not routes:
+            logger.error("No routes found. Cannot proceed with analysis.")
+            return {
+                "error": "No routes found",
+                "routes": [],
+                "resilience_scores": None,
+                "analysis_complete": False
+            }
+
+        logger.info("✓ Found %d route(s)", len(routes))
+
+        # Add route names
+        for i, route in enumerate(routes):
+            if "route_name" not in route or not route["route_name"]:
+                route["route_name"] = f"Route {i + 1}"
+
+        # Step 2: Run parallel analyses
+        logger.info("\n%s\nSTEP 2: RUNNING ANALYSES\n%s", _SEP60, _SEP60)
+
+        # Time, distance, and carbon analyses only read the route dicts
+        # and are independent of the safety step, so all of them run on
+        # one pool and overlap with the network-bound safety analysis
+        # below instead of executing back to back.
+        weather_results = []
+        road_results = []
+        safety_scores = {}
+
+        with ThreadPoolExecutor(max_workers=max(4, len(routes))) as pool:
+            logger.info("\n→ TIME ANALYSIS (concurrent)")
+            time_future = pool.submit(self.time_analyzer.analyze, routes)
+
+            logger.info("→ DISTANCE ANALYSIS (concurrent)")
+            distance_future = pool.submit(self.distance_analyzer.analyze, routes)
+
+            logger.info("→ CARBON EMISSION ANALYSIS (concurrent)")
+            carbon_future = pool.submit(self.carbon_analyzer.analyze, routes)
+
+            # Extract segments for all routes (called from main.py as
+            # requested)
+            logger.info("→ Extracting segments for %d route(s)", len(routes))
+            from ml_module.analysis.segmentation import extract_segments_for_routes
+            pre_extracted_segments = extract_segments_for_routes(routes)
+
+            # [Refactored] Consolidated Analysis via RoadSafetyScorer
+            # This replaces separate Weather and Road analysis calls.
+            # Each route's safety analysis is independent and
+            # network-bound (weather + OSM lookups); pool.map preserves
+            # input order.
+            logger.info("→ SAFETY, WEATHER & ROAD ANALYSIS")
+            analysis_results = list(pool.map(
+                lambda data: (data[0], self.road_safety_scorer.calculate(
+                    segment_data=data,
+                    osmnx_enabled=osmnx_enabled
+                )),
+                pre_extracted_segments
+            ))
+
+            time_results = time_future.result()
+            distance_results = distance_future.result()
+            carbon_results = carbon_future.result()
+
+        # Bail before the expensive downstream steps (resilience, Gemini)
+        # if a core analyzer came back empty or short: combining would
+        # only pair the wrong rows, and the costly work all comes later
+        for label, results in (("time", time_results),
+                               ("distance", distance_results),
+                               ("carbon", carbon_results),
+                               ("road_safety", analysis_results)):
+            if not results or len(results) != len(routes):
+                logger.warning(
+                    "%s analysis returned %d result(s) for %d route(s) - aborting",
+                    label, len(results or ()), len(routes))
                 return {
-                    "error": "No routes found",
+                    "error": f"{label}_analysis_failed",
                     "routes": [],
                     "resilience_scores": None,
                     "analysis_complete": False
                 }
-            
-            logger.info(f"✓ Found {len(routes)} route(s)")
-            
-            # Add route names
-            for i, route in enumerate(routes):
-                if "route_name" not in route or not route["route_name"]:
-                    route["route_name"] = f"Route {i + 1}"
-            
-            # Step 2: Run parallel analyses
-            logger.info("\n" + "="*60)
-            logger.info("STEP 2: RUNNING ANALYSES")
-            logger.info("="*60)
-            
-            # Time analysis
-            logger.info("\n→ TIME ANALYSIS")
-            time_results = self.time_analyzer.analyze(routes)
-            time_scores = {r["route_name"]: r["time_score"] for r in time_results}
-
-            # Distance analysis
-            logger.info("\n→ DISTANCE ANALYSIS")
-            distance_results = self.distance_analyzer.analyze(routes)
-            distance_scores = {r["route_name"]: r["distance_score"] for r in distance_results}
-
-            # Extract segments for all routes (called from main.py as requested)
-            logger.info(f"\n→ Extracting segments for {len(routes)} route(s)")
-            segments_data = extract_segments_for_routes(routes)
-            
-            # [Refactored] Consolidated Analysis via RoadSafetyScorer
-            # This replaces separate Weather and Road analysis calls
-            logger.info("\n→ SAFETY, WEATHER & ROAD ANALYSIS")
-            
-            weather_results = []
-            road_results = []
-            safety_scores = {}
-            
-            for idx, data in enumerate(segments_data):
-                route_name = data[0]
-                
-                # Perform full analysis
-                analysis_result = self.road_safety_scorer.calculate(
-                    segment_data=data,
-                    osmnx_enabled=osmnx_enabled
-                )
-                
-                # Extract components
-                safety_score = analysis_result["road_safety_score"]
-                w_result = analysis_result["weather_analysis"]
-                r_result = analysis_result["road_analysis"]
-                
-                # Add route name to results as expected by downstream logic
-                w_result["route_name"] = route_name
-                r_result["route_name"] = route_name
-                
-                # Store
-                safety_scores[route_name] = safety_score
-                weather_results.append(w_result)
-                road_results.append(r_result)
-                
-            road_quality_scores = {r["route_name"]: r.get("road_quality_score", 0) for r in road_results}
-            
-            # Carbon analysis
-            logger.info("\n→ CARBON EMISSION ANALYSIS")
-            carbon_results = self.carbon_analyzer.analyze(routes)
-            carbon_scores = {r["route_name"]: r["carbon_score"] for r in carbon_results}
-            
-            logger.info("\n✓ All analyses complete")
-            
-            # Step 3: Calculate resilience scores
-            logger.info("\n" + "="*60)
-            logger.info("STEP 3: CALCULATING RESILIENCE SCORES")
-            logger.info("="*60)
-            
-            route_names = [r["route_name"] for r in routes]
-            resilience_results = self.resilience_calculator.calculate(
-                routes=route_names,
-                time_scores=time_scores,
-                distance_scores=distance_scores,
-                carbon_scores=carbon_scores,
-                road_quality_scores=road_quality_scores,
-                priorities=user_priorities
-            )
-            
-            # Step 4: Gemini Summary Generation
-            logger.info("\n" + "="*60)
-            logger.info("STEP 4: GENERATING GEMINI SUMMARIES")
-            logger.info("="*60)
-            
+
+        time_scores = {r["route_name"]: r["time_score"] for r in time_results}
+        distance_scores = {r["route_name"]: r["distance_score"] for r in distance_results}
+
+        for route_name, analysis_result in analysis_results:
+            # Extract components
+            safety_score = analysis_result["road_safety_score"]
+            w_result = analysis_result["weather_analysis"]
+            r_result = analysis_result["road_analysis"]
+
+            # Add route name to results as expected by downstream logic
+            w_result["route_name"] = route_name
+            r_result["route_name"] = route_name
+
+            # Store
+            safety_scores[route_name] = safety_score
+            weather_results.append(w_result)
+            road_results.append(r_result)
+
+        road_quality_scores = {r["route_name"]: r.get("road_quality_score", 0) for r in road_results}
+
+        carbon_scores = {r["route_name"]: r["carbon_score"] for r in carbon_results}
+
+        logger.info("\n✓ All analyses complete")
+
+        # Step 3: Calculate resilience scores
+        logger.info("\n%s\nSTEP 3: CALCULATING RESILIENCE SCORES\n%s", _SEP60, _SEP60)
+
+        route_names = [r["route_name"] for r in routes]
+        resilience_results = self.resilience_calculator.calculate(
+            routes=route_names,
+            time_scores=time_scores,
+            distance_scores=distance_scores,
+            carbon_scores=carbon_scores,
+            road_quality_scores=road_quality_scores,
+            priorities=user_priorities
+        )
+
+        # Step 4: Gemini Summary Generation
+        logger.info("\n%s\nSTEP 4: GENERATING GEMINI SUMMARIES\n%s", _SEP60, _SEP60)
+
+        gemini_pool = None
+        gemini_future = None
+        gemini_results = {}
+
+        if gemini_enabled is False:
+            # Skip the LLM round-trip entirely; _combine_results already
+            # handles empty gemini_results via its `if gemini_results:`
+            # guard, so routes just carry the placeholder text.
+            logger.info("Gemini summaries disabled by caller - skipping")
+        else:
             # Prepare data for Gemini (pre-enrichment)
             # We construct a temporary enriched list to give context to Gemini
             temp_routes_data = []
@@ -235,8 +446,13 @@ class RouteAnalysisSystem:
                     "carbon_score": carbon_scores.get(r_name, 0),
                     "coordinates": r.get("coordinates", [])
                 })
-                
-            gemini_results = self.generate_summary(
+
+            # Gemini is pure network latency, so issue it as a future
+            # and let the local Step 5 dict assembly below overlap with
+            # the LLM round-trip instead of waiting for it first.
+            gemini_pool = ThreadPoolExecutor(max_workers=1)
+            gemini_future = gemini_pool.submit(
+                self.generate_summary,
                 routes_data=temp_routes_data,
                 overall_context={
                     "origin": origin_name,
@@ -246,95 +462,193 @@ class RouteAnalysisSystem:
             )
 
 
-            # Step 5: Combine all results into enriched routes
-            logger.info("\n" + "="*60)
-            logger.info("STEP 5: COMBINING RESULTS")
-            logger.info("="*60)
-            
-            enriched_routes = self._combine_results(
-                routes=routes,
-                time_results=time_results,
-                distance_results=distance_results,
-                carbon_results=carbon_results,
-                road_results=road_results,
-                resilience_results=resilience_results,
-                safety_scores=safety_scores,
-                gemini_results=gemini_results
-            )
-            
-            # Format resilience scores for output
-            formatted_scores = self.resilience_calculator.format_results(resilience_results)
-            
-            result = {
-                "routes": enriched_routes,
-                "resilience_scores": formatted_scores,
-                "best_route": formatted_scores["best_route_name"],
-                "analysis_complete": True
-            }
-            
-            logger.info("="*80)
-            logger.info("COMPREHENSIVE ROUTE ANALYSIS COMPLETE")
-            logger.info(f"✓ Analyzed {len(enriched_routes)} routes")
-            logger.info(f"✓ Best route: {formatted_scores['best_route_name']}")
-            logger.info(f"✓ Reason: {formatted_scores['reason_for_selection']}")
-            logger.info("="*80)
-            
-            return result
-            
-        except Exception as e:
-            logger.error(f"Error in route analysis: {str(e)}", exc_info=True)
-            return {
-                "error": str(e),
-                "routes": [],
-                "resilience_scores": None,
-                "analysis_complete": False
-            }
-    
+        # Step 5: Combine all results into enriched routes
+        logger.info("\n%s\nSTEP 5: COMBINING RESULTS\n%s", _SEP60, _SEP60)
+
+        # Assemble the numeric scaffold while Gemini is still in flight;
+        # its display fields are folded in by the second pass below.
+        enriched_routes = self._combine_results(
+            routes=routes,
+            time_results=time_results,
+            distance_results=distance_results,
+            carbon_results=carbon_results,
+            road_results=road_results,
+            resilience_results=resilience_results,
+            safety_scores=safety_scores,
+            gemini_results=None
+        )
+
+        # A Gemini failure only costs the summaries: log it, keep the numeric
+        # results, and report partial availability instead of failing the run
+        if gemini_future is not None:
+            try:
+                gemini_results = gemini_future.result()
+            except Exception as e:
+                logger.error("Gemini summary generation failed: %s", str(e))
+                gemini_results = {}
+            finally:
+                gemini_pool.shutdown(wait=False)
+        self._merge_gemini_results(enriched_routes, gemini_results)
+
+        # Format resilience scores for output
+        formatted_scores = self.resilience_calculator.format_results(resilience_results)
+
+        result = {
+            "routes": enriched_routes,
+            "resilience_scores": formatted_scores,
+            "best_route": formatted_scores["best_route_name"],
+            "gemini_available": bool(gemini_results),
+            "analysis_complete": True
+        }
+
+        logger.info("\n%s\nCOMPREHENSIVE ROUTE ANALYSIS COMPLETE", _SEP80)
+        logger.info("✓ Analyzed %d routes", len(enriched_routes))
+        logger.info("✓ Best route: %s", formatted_scores['best_route_name'])
+        logger.info("✓ Reason: %s\n%s", formatted_scores['reason_for_selection'], _SEP80)
+
+        return result
+
+
+    async def analyze_routes_async(self, *args, **kwargs) -> Dict[str, Any]:
+        """
+        Async wrapper around analyze_routes for event-loop hosts.
+
+        Runs the synchronous pipeline on a worker thread so an async web
+        server can await several analyses concurrently without blocking its
+        loop; the instance's pooled session is the single connection source,
+        so concurrent invocations share keep-alive connections rather than
+        multiplying handshakes. Accepts the same arguments as analyze_routes.
+        """
+        return await asyncio.to_thread(self.analyze_routes, *args, **kwargs)
+
+    def _route_cache_key(self,
+                         origin: Tuple[float, float],
+                         destination: Tuple[float, float],
+                         max_alternatives: int) -> str:
+        """Build a cache key from rounded endpoints and the current TTL bucket."""
+        bucket = int(time.time() // self.ROUTE_CACHE_TTL_S)
+        return (f"{round(origin[0], 5)},{round(origin[1], 5)},"
+                f"{round(destination[0], 5)},{round(destination[1], 5)},"
+                f"{max_alternatives},{bucket}")
+
     def _get_routes(self,
                    origin: Tuple[float, float],
                    destination: Tuple[float, float],
                    max_alternatives: int = 3) -> List[Dict[str, Any]]:
         """
         Get routes from Google Maps API with OSRM fallback.
-        
+
+        Results are cached per origin/destination/max_alternatives for
+        ROUTE_CACHE_TTL_S, in memory and on disk, so repeat queries skip the
+        external APIs entirely. Cached entries are stored as JSON text and
+        re-parsed on hit, which gives every caller an independent copy.
+
         Args:
             origin: (lat, lon) of origin
             destination: (lat, lon) of destination
             max_alternatives: Maximum number of alternative routes
-        
+
         Returns:
             List of route dictionaries
         """
-        # Try Google Maps first
-        logger.info("Attempting Google Maps API...")
-        routes = self.google_maps_client.get_directions(
-            origin=origin,
-            destination=destination,
-            alternatives=True
-        )
-        
+        key = self._route_cache_key(origin, destination, max_alternatives)
+
+        cached_text = self._route_cache.get(key)
+        if cached_text is None:
+            cache_path = self.ROUTE_CACHE_DIR / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.json"
+            if cache_path.exists():
+                try:
+                    cached_text = cache_path.read_text(encoding="utf-8")
+                    self._route_cache[key] = cached_text
+                except OSError as e:
+                    logger.warning("Failed to read route cache entry: %s", str(e))
+
+        if cached_text is not None:
+            logger.info("Routes served from cache")
+            return json.loads(cached_text)
+
+        routes = self._fetch_routes(origin, destination, max_alternatives)
+
         if routes:
-            logger.info(f"✓ Google Maps returned {len(routes)} route(s)")
-            return routes[:max_alternatives]
-        
-        # Fallback to OSRM
-        logger.warning("Google Maps unavailable, trying OSRM fallback...")
-        
-        if self.osrm_client.is_available():
-            logger.info("OSRM service is available")
-            routes = self.osrm_client.get_directions(
+            try:
+                text = json.dumps(routes)
+                self._route_cache[key] = text
+                self.ROUTE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                cache_path = self.ROUTE_CACHE_DIR / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.json"
+                cache_path.write_text(text, encoding="utf-8")
+            except (OSError, TypeError) as e:
+                logger.warning("Failed to write route cache entry: %s", str(e))
+
+        return routes
+
+    def _fetch_routes(self,
+                     origin: Tuple[float, float],
+                     destination: Tuple[float, float],
+                     max_alternatives: int = 3) -> List[Dict[str, Any]]:
+        """
+        Fetch routes from the external routing APIs (no caching).
+
+        Args:
+            origin: (lat, lon) of origin
+            destination: (lat, lon) of destination
+            max_alternatives: Maximum number of alternative routes
+
+        Returns:
+            List of route dictionaries
+        """
+        # Fire Google Maps and the OSRM fallback concurrently instead of
+        # waiting for Google to fully fail before even probing OSRM. Google
+        # is still preferred whenever it returns routes; the speculative OSRM
+        # call just means the fallback path no longer pays Google's timeout
+        # on top of its own latency.
+        logger.info("Attempting Google Maps API (with concurrent OSRM fallback)...")
+
+        # The executor is shut down without waiting: a with-block would
+        # block the Google-success path until the speculative OSRM call
+        # finished (its future starts immediately and cannot be cancelled),
+        # paying the full fallback latency on every happy-path request.
+        pool = ThreadPoolExecutor(max_workers=2)
+        try:
+            google_future = pool.submit(
+                self.google_maps_client.get_directions,
                 origin=origin,
                 destination=destination,
                 alternatives=True
             )
-            
+            osrm_future = pool.submit(self._fetch_osrm_routes, origin, destination)
+
+            routes = google_future.result()
+
             if routes:
-                logger.info(f"✓ OSRM returned {len(routes)} route(s)")
+                logger.info("✓ Google Maps returned %d route(s)", len(routes))
                 return routes[:max_alternatives]
-        
-        logger.error("Both Google Maps and OSRM failed")
-        return []
-    
+
+            logger.warning("Google Maps unavailable, using OSRM fallback...")
+            routes = osrm_future.result()
+
+            if routes:
+                logger.info("✓ OSRM returned %d route(s)", len(routes))
+                return routes[:max_alternatives]
+
+            logger.error("Both Google Maps and OSRM failed")
+            return []
+        finally:
+            # Abandon, never await, whatever is still in flight
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _fetch_osrm_routes(self,
+                          origin: Tuple[float, float],
+                          destination: Tuple[float, float]) -> Optional[List[Dict[str, Any]]]:
+        """Probe OSRM availability and fetch directions if the service is up."""
+        if not self.osrm_client.is_available():
+            return None
+        logger.info("OSRM service is available")
+        return self.osrm_client.get_directions(
+            origin=origin,
+            destination=destination,
+            alternatives=True
+        )
+
     def _combine_results(self,
                         routes: List[Dict[str, Any]],
                         time_results: List[Dict[str, Any]],
@@ -346,7 +660,7 @@ class RouteAnalysisSystem:
                         gemini_results: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
         Combine all analysis results into enriched route dictionaries.
-        
+
         Args:
             routes: Original route data
             time_results: Time analysis results
@@ -355,142 +669,200 @@ class RouteAnalysisSystem:
             road_results: Road analysis results
             resilience_results: Resilience calculation results
             safety_scores: Road safety scores
-        
+
         Returns:
             List of enriched route dictionaries
         """
-        # Create lookup dictionaries
-        time_lookup = {r["route_name"]: r for r in time_results}
-        distance_lookup = {r["route_name"]: r for r in distance_results}
-        carbon_lookup = {r["route_name"]: r for r in carbon_results}
-        road_lookup = {r["route_name"]: r for r in road_results}
+        # The analyzers emit their results in route order, so those lists are
+        # paired positionally instead of through five name-keyed lookups per
+        # route. Resilience results are sorted by score and keep a lookup.
+        # If an analyzer ever returns a short/misordered list, realign it by
+        # name rather than silently pairing the wrong rows.
+        def _aligned(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            lookup = {r.get("route_name"): r for r in results}
+            return [lookup.get(route.get("route_name", "Unknown"), _EMPTY_MAP) for route in routes]
+
+        if len(time_results) != len(routes):
+            logger.warning("Time results misaligned with routes; realigning by name")
+            time_results = _aligned(time_results)
+        if len(distance_results) != len(routes):
+            logger.warning("Distance results misaligned with routes; realigning by name")
+            distance_results = _aligned(distance_results)
+        if len(carbon_results) != len(routes):
+            logger.warning("Carbon results misaligned with routes; realigning by name")
+            carbon_results = _aligned(carbon_results)
+        if len(road_results) != len(routes):
+            logger.warning("Road results misaligned with routes; realigning by name")
+            road_results = _aligned(road_results)
+
         resilience_lookup = {r["route_name"]: r for r in resilience_results}
-        
+
+        # The scaled display metrics (minutes, percentage scores) come out of
+        # a few vectorized passes over float32 columns instead of per-route
+        # arithmetic inside the assembly loop. np.fromiter fills each column
+        # without an intermediate list; float32 is plenty for display fields.
+        n = len(routes)
+        pred_minutes = np.fromiter(
+            (t.get("duration_s", 0) for t in time_results),
+            dtype=np.float32, count=n) * np.float32(1.0 / 60.0)
+        carbon_pct = np.fromiter(
+            (c.get("carbon_score", 0) for c in carbon_results),
+            dtype=np.float32, count=n) * np.float32(100.0)
+        weather_risk_pct = np.fromiter(
+            (r.get("avg_weather_risk", 0) for r in road_results),
+            dtype=np.float32, count=n) * np.float32(100.0)
+        safety_arr = np.fromiter(
+            (safety_scores.get(r.get("route_name", "Unknown"), 0.5) for r in routes),
+            dtype=np.float32, count=n)
+        safety_pct = safety_arr * np.float32(100.0)
+
         enriched = []
-        
-        for route in routes:
+
+        for i, (route, time_data, distance_data, carbon_data, road_data) in enumerate(zip(
+                routes, time_results, distance_results, carbon_results, road_results)):
             route_name = route.get("route_name", "Unknown")
-            
-            # Get analysis results for this route
-            time_data = time_lookup.get(route_name, {})
-            distance_data = distance_lookup.get(route_name, {})
-            carbon_data = carbon_lookup.get(route_name, {})
-            road_data = road_lookup.get(route_name, {})
-            resilience_data = resilience_lookup.get(route_name, {})
-            safety_score = safety_scores.get(route_name, 0.5)
-            
+
+            resilience_data = resilience_lookup.get(route_name, _EMPTY_MAP)
+            safety_score = float(safety_arr[i])
+
             # Get Gemini analysis for this route
-            gemini_data = {}
+            gemini_data = _EMPTY_MAP
             if gemini_results:
-                gemini_data = gemini_results.get(route_name, {})
-                
-                      # --- LIMIT INTERMEDIATE CITIES TO 2 ---
-            raw_intermediate = gemini_data.get("intermediate_cities", [])
-
-            intermediate_cities = [
-                {
-                    "name": city.get("name"),
-                    "lat": city.get("lat"),
-                    "lon": city.get("lon")
-                }
-                for city in raw_intermediate
-                if isinstance(city, dict)
-                and "lat" in city
-                and "lon" in city
-            ][:2]
+                gemini_data = gemini_results.get(route_name, _EMPTY_MAP)
 
+            # Limit intermediate cities to 2
+            intermediate_cities = _limit_cities(gemini_data)
 
-                
             # Combine into enriched route
             enriched_route = {
                 "route_name": gemini_data.get("route_name", route_name),
-                
+
                 # Original route data
                 "distance_m": route.get("distance_m", 0),
                 "duration_s": route.get("duration_s", 0),
-                "steps": route.get("steps", []),
-                "coordinates": route.get("coordinates", []),
+                "steps": route.get("steps", _EMPTY_TUP),
+                "coordinates": route.get("coordinates", _EMPTY_TUP),
                 "overview_polyline": route.get("overview_polyline", ""),
-                
+
                 # Time analysis
-                "predicted_duration_min": time_data.get("duration_s", 0) / 60,
+                "predicted_duration_min": float(pred_minutes[i]),
                 "duration_text": time_data.get("duration_text", ""),
                 "time_score": time_data.get("time_score", 0),
-                
+
                 # Distance analysis
                 "distance_text": distance_data.get("distance_text", ""),
                 "distance_score": distance_data.get("distance_score", 0),
-                
+
                 # Carbon analysis
                 "total_carbon_kg": carbon_data.get("total_carbon_kg", 0),
                 "carbon_score": carbon_data.get("carbon_score", 0),
                 "carbon_per_km": carbon_data.get("carbon_per_km", 0),
-                
+
                 # Road analysis
-                "road_segments": road_data.get("road_segments", []),
+                "road_segments": road_data.get("road_segments", _EMPTY_TUP),
                 "road_quality_score": road_data.get("road_quality_score", 0),
                 "avg_weather_risk": road_data.get("avg_weather_risk", 0),
                 "total_rainfall": road_data.get("total_rainfall", 0),
                 "road_type_distribution": road_data.get("road_type_distribution", {}),
-                
+
                 # Road Safety Score (New)
                 "road_safety_score": safety_score,
-                
+
                 # Resilience score
                 "overall_resilience_score": resilience_data.get("overall_resilience_score", 0),
                 "component_scores": resilience_data.get("component_scores", {}),
                 "weighted_contributions": resilience_data.get("weighted_contributions", {}),
-                
+
                 # Gemini Analysis (New)
                 "gemini_analysis": {
                     "route_name": gemini_data.get("route_name", route_name),
                     "short_summary": gemini_data.get("short_summary", "Analysis pending..."),
                     "reasoning": gemini_data.get("reasoning", "Detailed analysis not available."),
                    "intermediate_cities": intermediate_cities,
-                    "weather_risk_score": road_data.get("avg_weather_risk", 0) * 100,
-                    "road_safety_score": safety_score * 100,
-                    "carbon_score": carbon_data.get("carbon_score", 0) * 100,
+                    "weather_risk_score": float(weather_risk_pct[i]),
+                    "road_safety_score": float(safety_pct[i]),
+                    "carbon_score": float(carbon_pct[i]),
                     "overall_resilience_score": resilience_data.get("overall_resilience_score", 0)
                 }
             }
-            
+
             enriched.append(enriched_route)
-            
-            logger.debug(f"Combined results for '{route_name}': "
-                        f"resilience={enriched_route['overall_resilience_score']:.2f}")
-        
-        logger.info(f"✓ Combined data for {len(enriched)} routes")
-        
+
+            logger.debug("Combined results for '%s': resilience=%.2f",
+                        route_name, enriched_route['overall_resilience_score'])
+
+        logger.info("✓ Combined data for %d routes", len(enriched))
+
         return enriched
 
+    def _merge_gemini_results(self,
+                              enriched_routes: List[Dict[str, Any]],
+                              gemini_results: Optional[Dict[str, Any]]) -> None:
+        """
+        Fold resolved Gemini summaries into already-combined routes.
+
+        Kept separate from _combine_results so the numeric scaffold can be
+        assembled while the Gemini future is still in flight; this second
+        pass only touches the display fields a summary provides, leaving the
+        placeholders from _combine_results in place for routes without one.
+
+        Args:
+            enriched_routes: Output of _combine_results (mutated in place)
+            gemini_results: Gemini summaries keyed by route name, or None
+        """
+        if not gemini_results:
+            return
+
+        for enriched_route in enriched_routes:
+            route_name = enriched_route["route_name"]
+            gemini_data = gemini_results.get(route_name)
+            if not gemini_data:
+                continue
+
+            display_name = gemini_data.get("route_name", route_name)
+            gemini_analysis = enriched_route["gemini_analysis"]
+            gemini_analysis["route_name"] = display_name
+            gemini_analysis["short_summary"] = gemini_data.get(
+                "short_summary", gemini_analysis["short_summary"])
+            gemini_analysis["reasoning"] = gemini_data.get(
+                "reasoning", gemini_analysis["reasoning"])
+            gemini_analysis["intermediate_cities"] = _limit_cities(gemini_data)
+            enriched_route["route_name"] = display_name
+
+        logger.info("✓ Merged Gemini summaries for %d routes", len(gemini_results))
+
 if __name__ == "__main__":
     try:
         # Simple argument parsing
         # Usage: python main.py "Origin" "Destination" '{"time": 0.5, ...}'
-        
+
         if len(sys.argv) < 3:
             logger.error("Usage: python main.py <origin> <destination> [priorities_json]")
             # Print empty JSON to avoid crashing node parser if possible, or just exit
             print(json.dumps({"error": "Missing arguments"}))
             sys.exit(1)
-            
+
         origin = sys.argv[1]
         destination = sys.argv[2]
-        
+
         priorities = None
         if len(sys.argv) > 3:
             try:
                 priorities = json.loads(sys.argv[3])
             except:
                 logger.warning("Could not parse priorities JSON, using defaults")
-        
+
         system = RouteAnalysisSystem()
         result = system.analyze_routes(origin, destination, priorities)
-        
-        # Output result as JSON to stdout
-        print(json.dumps(result, default=str))
-        
+
+        # Output result as JSON to stdout. Raw bytes avoid the intermediate
+        # str + encode of print(json.dumps(...)) on a payload that carries
+        # every route's coordinates, steps, and road segments.
+        sys.stdout.buffer.write(_dumps_bytes(result))
+        sys.stdout.buffer.write(b"\n")
+        sys.stdout.buffer.flush()
+
     except Exception as e:
-        logger.error(f"Critical System Error: {str(e)}")
+        logger.error("Critical System Error: %s", str(e))
         print(json.dumps({"error": str(e), "status": "error"}))
         sys.exit(1)
@@ -3,13 +3,31 @@ OpenRouteService Fallback Client
 Used when Google Maps API is unavailable
 """
 
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import List, Dict, Optional, Tuple, Any
 from ..config.api_keys import get_openrouteservice_key
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Try to import orjson (optional dependency): ORS GeoJSON responses carry
+# full route geometries, where the C parser decodes several times faster
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _decode_response(response: requests.Response) -> Any:
+    """Decode an HTTP JSON body with orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
 
 class OpenRouteServiceClient:
     """
@@ -17,15 +35,54 @@ class OpenRouteServiceClient:
     """
     
     BASE_URL = "https://api.openrouteservice.org/v2"
-    
-    def __init__(self, api_key: Optional[str] = None):
+
+    # Below this many points, converting to an ndarray costs more than the
+    # four Python reductions it replaces
+    BOUNDS_VECTORIZE_MIN = 32
+
+    def __init__(self, api_key: Optional[str] = None,
+                 session: Optional[requests.Session] = None):
         """
         Initialize OpenRouteService client.
-        
+
         Args:
             api_key: OpenRouteService API key. If None, tries to load from environment.
+            session: Optional shared requests.Session. Passing one lets the
+                orchestrator pool connections across all API clients; a
+                pooled private session is created when used standalone.
         """
         self.api_key = api_key or get_openrouteservice_key()
+
+        if session is not None:
+            self.session = session
+        else:
+            # Pooled session so keep-alive amortizes the TCP/TLS handshake
+            # across repeated fallback requests; POST must be allowed
+            # explicitly since urllib3 excludes it from retries by default
+            # and the ORS directions call is a POST
+            self.session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=10,
+                pool_maxsize=20,
+                max_retries=Retry(
+                    total=3, connect=3, read=3, backoff_factor=0.5,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=frozenset(["GET", "POST"]),
+                    respect_retry_after_header=True
+                )
+            )
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+
+        # Request constants are invariant for the client's lifetime, so
+        # build the headers dict once and memoize per-profile endpoint URLs
+        # instead of re-allocating both on every call
+        self._headers = {
+            "Authorization": self.api_key or "",
+            "Content-Type": "application/json"
+        }
+        self._url_cache: Dict[str, str] = {}
+
         if not self.api_key:
             logger.warning("OpenRouteService API key not found. Fallback may not work.")
     
@@ -53,12 +110,9 @@ class OpenRouteServiceClient:
             return None
         
         try:
-            url = f"{self.BASE_URL}/directions/{profile}"
-            headers = {
-                "Authorization": self.api_key,
-                "Content-Type": "application/json"
-            }
-            
+            url = self._url_cache.setdefault(
+                profile, f"{self.BASE_URL}/directions/{profile}")
+
             coords = [[origin[1], origin[0]], [destination[1], destination[0]]]  # ORS uses [lat, lon]
             
             params = {
@@ -73,10 +127,10 @@ class OpenRouteServiceClient:
                 }
             
             logger.info(f"Requesting directions from {origin} to {destination} (fallback)")
-            response = requests.post(url, json=params, headers=headers, timeout=15)
+            response = self.session.post(url, json=params, headers=self._headers, timeout=15)
             response.raise_for_status()
             
-            data = response.json()
+            data = _decode_response(response)
             
             routes = []
             for feature in data.get("features", []):
@@ -89,6 +143,11 @@ class OpenRouteServiceClient:
         except requests.exceptions.RequestException as e:
             logger.error(f"Network error getting directions (fallback): {str(e)}")
             return None
+        except (ValueError, KeyError, TypeError) as e:
+            # Malformed payloads log one line; exc_info stays reserved for
+            # the genuinely unexpected catch-all below
+            logger.error("Parse error in ORS response (%s): %s", type(e).__name__, e)
+            return None
         except Exception as e:
             logger.error(f"Unexpected error getting directions (fallback): {str(e)}", exc_info=True)
             return None
@@ -108,9 +167,18 @@ class OpenRouteServiceClient:
         geometry = feature.get("geometry", {})
         coordinates = geometry.get("coordinates", [])
         
-        # Convert coordinates from [lon, lat] to [lat, lon] for consistency
-        converted_coords = [[coord[1], coord[0]] for coord in coordinates]
-        
+        # Convert coordinates from [lon, lat] to [lat, lon] for consistency:
+        # one reversed-axis slice swaps every pair in a single C loop instead
+        # of allocating a fresh two-element list per point. The ndarray feeds
+        # bounds directly; .tolist() materializes plain lists only at the
+        # JSON boundary where downstream consumers expect them.
+        if coordinates:
+            coords_arr = np.asarray(coordinates, dtype=np.float64)[:, ::-1]
+            converted_coords = coords_arr.tolist()
+        else:
+            coords_arr = np.empty((0, 2), dtype=np.float64)
+            converted_coords = []
+
         # Extract segments/steps if available
         segments = properties.get("segments", [])
         steps = []
@@ -134,7 +202,7 @@ class OpenRouteServiceClient:
             "steps": steps,
             "overview_polyline": "",  # ORS doesn't provide polyline in same format
             "coordinates": converted_coords,  # Store coordinates for visualization
-            "bounds": self._calculate_bounds(converted_coords),
+            "bounds": self._calculate_bounds(coords_arr),
             "summary": f"Route via {summary.get('roads', ['unknown'])[0] if summary.get('roads') else 'unknown'}",
             "warnings": [],
             "waypoint_order": []
@@ -150,12 +218,23 @@ class OpenRouteServiceClient:
         Returns:
             Bounds dictionary
         """
-        if not coordinates:
+        if len(coordinates) == 0:
             return {"northeast": {"lat": 0, "lng": 0}, "southwest": {"lat": 0, "lng": 0}}
-        
+
+        # Long polylines: two C-level reductions over one contiguous array
+        # instead of four Python passes over boxed floats
+        if isinstance(coordinates, np.ndarray) or len(coordinates) >= self.BOUNDS_VECTORIZE_MIN:
+            arr = np.asarray(coordinates, dtype=np.float64)
+            mins = arr.min(axis=0)
+            maxs = arr.max(axis=0)
+            return {
+                "northeast": {"lat": float(maxs[0]), "lng": float(maxs[1])},
+                "southwest": {"lat": float(mins[0]), "lng": float(mins[1])}
+            }
+
         lats = [coord[0] for coord in coordinates]
         lons = [coord[1] for coord in coordinates]
-        
+
         return {
             "northeast": {"lat": max(lats), "lng": max(lons)},
             "southwest": {"lat": min(lats), "lng": min(lons)}
@@ -4,12 +4,48 @@ Handles Directions, Places, and Roads APIs with comprehensive error handling
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Dict, Optional, Tuple, Any
 from ..config.api_keys import get_google_maps_key
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Try to import orjson (optional dependency): directions responses run to
+# hundreds of KB of nested JSON, where it decodes several times faster
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _decode_response(response: requests.Response) -> Any:
+    """Decode an HTTP JSON body with orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def _format_point(point: Tuple[float, float]) -> str:
+    """Format a (lat, lon) pair for an API query string at ~11 cm precision."""
+    return "%.6f,%.6f" % (point[0], point[1])
+
+
+@lru_cache(maxsize=128)
+def _encode_waypoints(waypoints: Tuple[Tuple[float, float], ...]) -> str:
+    """
+    Join waypoints into the pipe-delimited Directions API format.
+
+    Cached because retries and alternative-route requests over the same
+    corridor resend identical waypoint lists; the tuple key makes the
+    encoded string reusable across calls.
+    """
+    return "|".join(_format_point(wp) for wp in waypoints)
+
 
 class GoogleMapsClient:
     """
@@ -18,14 +54,46 @@ class GoogleMapsClient:
     
     BASE_URL = "https://maps.googleapis.com/maps/api"
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None,
+                 session: Optional[requests.Session] = None):
         """
         Initialize Google Maps client.
-        
+
         Args:
             api_key: Google Maps API key. If None, tries to load from environment.
+            session: Optional shared requests.Session. Passing one lets the
+                orchestrator pool connections across all API clients; a
+                private session is created when used standalone.
         """
         self.api_key = api_key or get_google_maps_key()
+
+        if session is not None:
+            self.session = session
+        else:
+            # Standalone session still pools connections and retries
+            # transient 429/5xx responses with exponential backoff, so one
+            # rate-limit blip doesn't surface as a failed plan
+            self.session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=10,
+                pool_maxsize=20,
+                max_retries=Retry(
+                    total=3, connect=3, read=3, backoff_factor=0.5,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=frozenset(["GET", "POST"]),
+                    respect_retry_after_header=True
+                )
+            )
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+
+        # Endpoint URLs are constant for the client's lifetime; building
+        # them once keeps the f-string off the per-request path
+        self._directions_url = f"{self.BASE_URL}/directions/json"
+        self._place_details_url = f"{self.BASE_URL}/place/details/json"
+        self._snap_url = f"{self.BASE_URL}/roads/snapToRoads"
+        self._speed_limits_url = f"{self.BASE_URL}/roads/speedLimits"
+
         if not self.api_key:
             logger.warning("Google Maps API key not found. API calls will fail.")
     
@@ -56,24 +124,22 @@ class GoogleMapsClient:
             return None
         
         try:
-            url = f"{self.BASE_URL}/directions/json"
             params = {
-                "origin": f"{origin[0]},{origin[1]}",
-                "destination": f"{destination[0]},{destination[1]}",
+                "origin": _format_point(origin),
+                "destination": _format_point(destination),
                 "key": self.api_key,
                 "alternatives": str(alternatives).lower(),
                 "mode": mode
             }
-            
+
             if waypoints:
-                waypoint_str = "|".join([f"{wp[0]},{wp[1]}" for wp in waypoints])
-                params["waypoints"] = waypoint_str
+                params["waypoints"] = _encode_waypoints(tuple(waypoints))
             
             logger.info(f"Requesting directions from {origin} to {destination}")
-            response = requests.get(url, params=params, timeout=15)
+            response = self.session.get(self._directions_url, params=params, timeout=15)
             response.raise_for_status()
             
-            data = response.json()
+            data = _decode_response(response)
             
             if data.get("status") != "OK":
                 logger.error(f"Google Maps Directions API error: {data.get('status')} - {data.get('error_message', 'Unknown error')}")
@@ -90,10 +156,53 @@ class GoogleMapsClient:
         except requests.exceptions.RequestException as e:
             logger.error(f"Network error getting directions: {str(e)}")
             return None
+        except (ValueError, KeyError, TypeError) as e:
+            # Malformed payloads are routine when an upstream flaps; a
+            # one-line log avoids walking the stack for every concurrent
+            # failure, keeping exc_info for the genuinely unexpected below
+            logger.error("Parse error getting directions (%s): %s", type(e).__name__, e)
+            return None
         except Exception as e:
             logger.error(f"Unexpected error getting directions: {str(e)}", exc_info=True)
             return None
     
+    def get_directions_batch(
+        self,
+        pairs: List[Tuple[Tuple[float, float], Tuple[float, float]]],
+        alternatives: bool = True,
+        mode: str = "driving",
+        max_workers: int = 8
+    ) -> List[Optional[List[Dict[str, Any]]]]:
+        """
+        Get directions for many origin/destination pairs concurrently.
+
+        The per-pair requests are independent and network-bound, so they fan
+        out over a bounded thread pool sharing this client's pooled session:
+        N round-trips overlap on kept-alive connections instead of running
+        back to back, and the pool size caps in-flight requests against the
+        host.
+
+        Args:
+            pairs: List of (origin, destination) coordinate-tuple pairs
+            alternatives: Whether to return alternative routes per pair
+            mode: Travel mode (driving, walking, bicycling, transit)
+            max_workers: Maximum concurrent requests
+
+        Returns:
+            List aligned with pairs; each entry is the route list for that
+            pair, or None where the request failed
+        """
+        if not pairs:
+            return []
+
+        logger.info("Fetching directions for %d pair(s) concurrently", len(pairs))
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(pairs))) as pool:
+            return list(pool.map(
+                lambda pair: self.get_directions(
+                    pair[0], pair[1], alternatives=alternatives, mode=mode),
+                pairs
+            ))
+
     def _parse_route(self, route: Dict, geocoded_waypoints: List) -> Dict[str, Any]:
         """
         Parse a route from Google Maps API response.
@@ -142,32 +251,41 @@ class GoogleMapsClient:
     def _decode_polyline(self, polyline_str: str) -> List[List[float]]:
         """
         Decodes a Google Maps encoded polyline string into a list of [lat, lng] pairs.
+
+        The decode runs once per route over strings that reach tens of KB,
+        so the varint loop works on raw byte values with the lat and lng
+        deltas unrolled into plain locals - no per-character ord() call, no
+        dict lookups, and no list literal driving an inner for-loop.
         """
+        # Polyline encoding is pure ASCII; indexing bytes yields ints directly
+        data = polyline_str.encode("ascii")
+        length = len(data)
         index, lat, lng = 0, 0, 0
-        coordinates = []
-        changes = {'latitude': 0, 'longitude': 0}
-
-        while index < len(polyline_str):
-            for unit in ['latitude', 'longitude']:
-                shift, result = 0, 0
+        coordinates: List[List[float]] = []
+        append = coordinates.append
 
-                while True:
-                    byte = ord(polyline_str[index]) - 63
-                    index += 1
-                    result |= (byte & 0x1f) << shift
-                    shift += 5
-                    if not byte >= 0x20:
-                        break
+        while index < length:
+            result, shift = 0, 0
+            while True:
+                byte = data[index] - 63
+                index += 1
+                result |= (byte & 0x1f) << shift
+                shift += 5
+                if byte < 0x20:
+                    break
+            lat += ~(result >> 1) if result & 1 else result >> 1
 
-                if (result & 1):
-                    changes[unit] = ~(result >> 1)
-                else:
-                    changes[unit] = (result >> 1)
+            result, shift = 0, 0
+            while True:
+                byte = data[index] - 63
+                index += 1
+                result |= (byte & 0x1f) << shift
+                shift += 5
+                if byte < 0x20:
+                    break
+            lng += ~(result >> 1) if result & 1 else result >> 1
 
-            lat += changes['latitude']
-            lng += changes['longitude']
-
-            coordinates.append([lat / 100000.0, lng / 100000.0])
+            append([lat / 100000.0, lng / 100000.0])
 
         return coordinates
     
@@ -186,7 +304,6 @@ class GoogleMapsClient:
             return None
         
         try:
-            url = f"{self.BASE_URL}/place/details/json"
             params = {
                 "place_id": place_id,
                 "key": self.api_key,
@@ -194,10 +311,10 @@ class GoogleMapsClient:
             }
             
             logger.debug(f"Requesting place details for place_id: {place_id}")
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(self._place_details_url, params=params, timeout=10)
             response.raise_for_status()
             
-            data = response.json()
+            data = _decode_response(response)
             
             if data.get("status") != "OK":
                 logger.warning(f"Places API error: {data.get('status')}")
@@ -208,6 +325,9 @@ class GoogleMapsClient:
         except requests.exceptions.RequestException as e:
             logger.error(f"Network error getting place details: {str(e)}")
             return None
+        except (ValueError, KeyError, TypeError) as e:
+            logger.error("Parse error getting place details (%s): %s", type(e).__name__, e)
+            return None
         except Exception as e:
             logger.error(f"Unexpected error getting place details: {str(e)}", exc_info=True)
             return None
@@ -227,7 +347,6 @@ class GoogleMapsClient:
             return None
         
         try:
-            url = f"{self.BASE_URL}/roads/snapToRoads"
             path_str = "|".join([f"{p[0]},{p[1]}" for p in path])
             params = {
                 "path": path_str,
@@ -236,10 +355,10 @@ class GoogleMapsClient:
             }
             
             logger.debug(f"Snapping {len(path)} points to roads")
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(self._snap_url, params=params, timeout=10)
             response.raise_for_status()
             
-            data = response.json()
+            data = _decode_response(response)
             
             if data.get("status") != "OK":
                 logger.warning(f"Roads API error: {data.get('status')}")
@@ -250,6 +369,9 @@ class GoogleMapsClient:
         except requests.exceptions.RequestException as e:
             logger.error(f"Network error snapping to roads: {str(e)}")
             return None
+        except (ValueError, KeyError, TypeError) as e:
+            logger.error("Parse error snapping to roads (%s): %s", type(e).__name__, e)
+            return None
         except Exception as e:
             logger.error(f"Unexpected error snapping to roads: {str(e)}", exc_info=True)
             return None
@@ -272,7 +394,6 @@ class GoogleMapsClient:
             return []
         
         try:
-            url = f"{self.BASE_URL}/roads/speedLimits"
             place_ids_str = "|".join(place_ids)
             params = {
                 "placeIds": place_ids_str,
@@ -280,10 +401,10 @@ class GoogleMapsClient:
             }
             
             logger.debug(f"Getting speed limits for {len(place_ids)} places")
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(self._speed_limits_url, params=params, timeout=10)
             response.raise_for_status()
             
-            data = response.json()
+            data = _decode_response(response)
             
             if data.get("status") != "OK":
                 logger.warning(f"Roads API speed limits error: {data.get('status')}")
@@ -294,6 +415,9 @@ class GoogleMapsClient:
         except requests.exceptions.RequestException as e:
             logger.error(f"Network error getting speed limits: {str(e)}")
             return None
+        except (ValueError, KeyError, TypeError) as e:
+            logger.error("Parse error getting speed limits (%s): %s", type(e).__name__, e)
+            return None
         except Exception as e:
             logger.error(f"Unexpected error getting speed limits: {str(e)}", exc_info=True)
             return None
@@ -7,10 +7,27 @@ Provides compatible interface with Google Maps client.
 
 from typing import List, Dict, Any, Optional, Tuple
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from ..utils.logger import get_logger
 
 logger = get_logger("ml_module.routes.osrm")
 
+# Try to import orjson (optional dependency) for faster decoding of the
+# large GeoJSON route geometries OSRM returns
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _decode_response(response: requests.Response) -> Any:
+    """Decode an HTTP JSON body with orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
 
 class OSRMClient:
     """
@@ -22,14 +39,37 @@ class OSRMClient:
     # Public OSRM server (can be replaced with self-hosted instance)
     BASE_URL = "http://router.project-osrm.org"
     
-    def __init__(self, base_url: Optional[str] = None):
+    def __init__(self, base_url: Optional[str] = None,
+                 session: Optional[requests.Session] = None):
         """
         Initialize OSRM client.
-        
+
         Args:
             base_url: Optional custom OSRM server URL
+            session: Optional shared requests.Session for connection pooling
         """
         self.base_url = base_url or self.BASE_URL
+
+        if session is not None:
+            self.session = session
+        else:
+            # Standalone session pools connections and retries transient
+            # 429/5xx responses with exponential backoff - the public OSRM
+            # server rate-limits aggressively
+            self.session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=10,
+                pool_maxsize=20,
+                max_retries=Retry(
+                    total=3, connect=3, read=3, backoff_factor=0.5,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=frozenset(["GET", "POST"]),
+                    respect_retry_after_header=True
+                )
+            )
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+
         logger.info(f"OSRMClient initialized with base URL: {self.base_url}")
     
     def is_available(self) -> bool:
@@ -40,7 +80,7 @@ class OSRMClient:
             True if service is reachable, False otherwise
         """
         try:
-            response = requests.get(f"{self.base_url}/nearest/v1/driving/0,0", timeout=5)
+            response = self.session.get(f"{self.base_url}/nearest/v1/driving/0,0", timeout=5)
             return response.status_code in [200, 400]  # 400 is okay, means service is up
         except Exception as e:
             logger.warning(f"OSRM service unavailable: {str(e)}")
@@ -81,10 +121,10 @@ class OSRMClient:
             logger.debug(f"OSRM request URL: {url}")
             logger.debug(f"OSRM params: {params}")
             
-            response = requests.get(url, params=params, timeout=15)
+            response = self.session.get(url, params=params, timeout=15)
             response.raise_for_status()
             
-            data = response.json()
+            data = _decode_response(response)
             
             if data.get("code") != "Ok":
                 logger.error(f"OSRM error: {data.get('code')} - {data.get('message', 'Unknown error')}")
@@ -101,6 +141,11 @@ class OSRMClient:
         except requests.exceptions.RequestException as e:
             logger.error(f"Network error getting OSRM directions: {str(e)}")
             return None
+        except (ValueError, KeyError, TypeError) as e:
+            # Malformed payloads log one line; exc_info stays reserved for
+            # the genuinely unexpected catch-all below
+            logger.error("Parse error in OSRM response (%s): %s", type(e).__name__, e)
+            return None
         except Exception as e:
             logger.error(f"Unexpected error getting OSRM directions: {str(e)}", exc_info=True)
             return None
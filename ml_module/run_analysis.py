@@ -107,13 +107,14 @@ def run_analysis(
                 logger.info(f"✓ Best route: {best_route}")
                 
                 logger.info("\nRoute Rankings:")
+                # Build the name -> score lookup once instead of scanning the
+                # routes list per ranked entry
+                scores_by_name = {
+                    r["route_name"]: r["overall_resilience_score"]
+                    for r in scores_data.get("routes", [])
+                }
                 for i, route_name in enumerate(scores_data.get("ranked_routes", []), 1):
-                    # Find score for this route
-                    route_score = next(
-                        (r["overall_resilience_score"] for r in scores_data.get("routes", [])
-                         if r["route_name"] == route_name),
-                        0
-                    )
+                    route_score = scores_by_name.get(route_name, 0)
                     logger.info(f"  {i}. {route_name}: Score = {route_score:.2f}/100")
         
         logger.info("="*80)
@@ -2,10 +2,85 @@
 Centralized logging configuration for the ML module
 """
 
+import atexit
 import logging
 import os
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
+
+# Listeners started by _get_queue_handler, kept so atexit can stop them and
+# flush any records still queued when the process exits
+_listeners = []
+
+# One queue/listener/handler stack per log file, shared by every named
+# logger that targets it. Each logger owning its own RotatingFileHandler on
+# the same path would race at the rotation threshold: several listeners can
+# roll the file concurrently, burning backup generations and leaving stale
+# descriptors writing to a rotated-away file.
+_queue_handlers: Dict[str, QueueHandler] = {}
+
+
+def _stop_listeners() -> None:
+    """Stop all queue listeners, draining pending records to their handlers."""
+    for listener in _listeners:
+        try:
+            listener.stop()
+        except Exception:
+            pass
+    _listeners.clear()
+
+
+atexit.register(_stop_listeners)
+
+
+def _get_queue_handler(log_file: str) -> QueueHandler:
+    """
+    Return the shared QueueHandler for a log file, building its listener,
+    rotating file handler and console handler on first use.
+    """
+    handler = _queue_handlers.get(log_file)
+    if handler is not None:
+        return handler
+
+    # Create formatters
+    detailed_formatter = logging.Formatter(
+        '[%(asctime)s] [%(name)s] [%(levelname)s] [%(funcName)s:%(lineno)d] %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+    console_formatter = logging.Formatter(
+        '[%(levelname)s] %(message)s'
+    )
+
+    # File handler: rotate at 50 MB with a few backups so the DEBUG stream
+    # can't grow the log without bound, and delay opening the file until
+    # the first record actually needs it
+    file_handler = RotatingFileHandler(
+        log_file, maxBytes=50 * 1024 * 1024, backupCount=5,
+        encoding='utf-8', delay=True
+    )
+    file_handler.setLevel(logging.DEBUG)
+    file_handler.setFormatter(detailed_formatter)
+
+    # Console handler
+    console_handler = logging.StreamHandler(sys.stderr)
+    console_handler.setLevel(logging.INFO)
+    console_handler.setFormatter(console_formatter)
+
+    # Loggers only enqueue; the single listener thread owns the real
+    # handlers and performs the actual writes off the request path
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    listener.start()
+    _listeners.append(listener)
+
+    handler = QueueHandler(log_queue)
+    _queue_handlers[log_file] = handler
+    return handler
 
 
 def setup_logger(
@@ -15,22 +90,28 @@ def setup_logger(
 ) -> logging.Logger:
     """
     Set up a logger with both file and console handlers.
-    
+
+    Records are handed off through a QueueHandler and written by a
+    background QueueListener thread, so hot-path log calls never block on
+    file or terminal writes; under threaded fan-out the handlers stop being
+    a serialization point. Loggers targeting the same file share one
+    listener and one rotating handler.
+
     Args:
         name: Logger name
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR)
         log_file: Optional path to log file. If None, logs to 'logs/ml_module.log'
-    
+
     Returns:
         Configured logger instance
     """
     logger = logging.getLogger(name)
     logger.setLevel(getattr(logging, log_level.upper(), logging.INFO))
-    
+
     # Avoid adding handlers multiple times
     if logger.handlers:
         return logger
-    
+
     # Create logs directory if it doesn't exist
     if log_file is None:
         log_dir = Path("logs")
@@ -39,40 +120,19 @@ def setup_logger(
     else:
         log_path = Path(log_file)
         log_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    # Create formatters
-    detailed_formatter = logging.Formatter(
-        '[%(asctime)s] [%(name)s] [%(levelname)s] [%(funcName)s:%(lineno)d] %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    console_formatter = logging.Formatter(
-        '[%(levelname)s] %(message)s'
-    )
-    
-    # File handler
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
-    file_handler.setLevel(logging.DEBUG)
-    file_handler.setFormatter(detailed_formatter)
-    logger.addHandler(file_handler)
-    
-    import sys
-    
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stderr)
-    console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
-    
+
+    logger.addHandler(_get_queue_handler(str(Path(log_file).resolve())))
+
     return logger
 
 
 def get_logger(name: str = "ml_module") -> logging.Logger:
     """
     Get an existing logger or create a new one with default settings.
-    
+
     Args:
         name: Logger name
-    
+
     Returns:
         Logger instance
     """
@@ -80,4 +140,3 @@ def get_logger(name: str = "ml_module") -> logging.Logger:
     if not logger.handlers:
         return setup_logger(name)
     return logger
-